@@ -6,11 +6,11 @@ import re
 import pandas as pd
 from typing import List, Dict, Optional
 from models.statement import StatementData, Transaction
-from utils.table_aware_extractor import TableAwarePDFExtractor
+from utils.table_aware_extractor import shared_extractor
 
 class AmexTableParser:
     def __init__(self):
-        self.extractor = TableAwarePDFExtractor()
+        self.extractor = shared_extractor()
     
     def can_parse(self, text: str) -> bool:
         indicators = [
@@ -5,12 +5,12 @@ Enhanced HDFC Parser with Table-Aware Extraction
 import re
 import pandas as pd
 from models.statement import StatementData, Transaction
-from utils.table_aware_extractor import TableAwarePDFExtractor
+from utils.table_aware_extractor import shared_extractor
 from typing import List, Dict, Optional
 
 class HDFCTableParser:
     def __init__(self):
-        self.extractor = TableAwarePDFExtractor()
+        self.extractor = shared_extractor()
     
     def can_parse(self, text: str) -> bool:
         indicators = ['hdfc bank', 'hdfcbank', 'hdfc credit card', 'times card']
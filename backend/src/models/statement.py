@@ -2,14 +2,14 @@ from dataclasses import dataclass
 from datetime import date
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     date: str
     description: str
     amount: float
     category: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class StatementData:
     issuer: str
     card_last_four: str
@@ -2,17 +2,55 @@ import re
 from models.statement import StatementData, Transaction
 from parsers.base_parser import BaseParser
 
+_CARD_NUMBER_PATTERNS = [
+    re.compile(r'Membership Number.*?[Xx*]{4}[-\s]*[Xx*]{6}[-\s]*(\d{5})', re.IGNORECASE | re.DOTALL),
+    re.compile(r'Card Number.*?[Xx*]{4}[-\s]*[Xx*]{6}[-\s]*(\d{5})', re.IGNORECASE | re.DOTALL),
+    re.compile(r'[Xx*]{4}[-\s]*[Xx*]{6}[-\s]*(\d{5})', re.IGNORECASE | re.DOTALL),
+]
+
+_BILLING_CYCLE_PATTERNS = [
+    re.compile(r'Statement Period.*?From\s+([A-Za-z]+\s+\d{1,2})\s+to\s+([A-Za-z]+\s+\d{1,2},?\s*\d{4})', re.IGNORECASE | re.DOTALL),
+    re.compile(r'Statement Period.*?(\d{1,2}/\d{1,2}/\d{4})\s*to\s*(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE | re.DOTALL),
+    re.compile(r'Closing Date.*?([A-Za-z]+\s+\d{1,2},?\s*\d{4})', re.IGNORECASE | re.DOTALL),
+]
+
+_DUE_DATE_PATTERNS = [
+    re.compile(r'Minimum Payment Due.*?([A-Za-z]+\s+\d{1,2},?\s*\d{4})', re.IGNORECASE),
+    re.compile(r'Payment Due Date.*?(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE),
+    re.compile(r'Due Date.*?(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE),
+]
+
+_BALANCE_PATTERNS = [
+    re.compile(r'Closing Balance Rs\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'New Balance.*?Rs\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Total Amount Due.*?Rs\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Total Dues\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_MINIMUM_PATTERNS = [
+    re.compile(r'Min Payment Due Rs\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Minimum Payment Due.*?Rs\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Minimum Amount Due\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_TRANSACTION_PATTERNS = [
+    re.compile(r'([A-Za-z]{3}\s+\d{1,2})\s+([A-Z][A-Z0-9\s\-\.&]{3,50}?)\s+([\d,]+\.?\d*)', re.MULTILINE),
+    re.compile(r'(\d{1,2}/\d{1,2}/\d{4})\s+([A-Z][A-Z0-9\s\-\.&]{3,50}?)\s+([\d,]+\.?\d*)', re.MULTILINE),
+]
+
 class AmexIndiaParser(BaseParser):
+    # Issuer tokens searched for in the lowercased statement text
+    INDICATORS = [
+        'american express', 
+        'amex', 
+        'americanexpress.co.in',
+        'American Express Banking Corp',
+        'AEBC'
+    ]
+    
     def can_parse(self, text: str) -> bool:
-        indicators = [
-            'american express', 
-            'amex', 
-            'americanexpress.co.in',
-            'American Express Banking Corp',
-            'AEBC'
-        ]
         text_lower = text.lower()
-        return any(indicator in text_lower for indicator in indicators)
+        return any(indicator in text_lower for indicator in self.INDICATORS)
     
     def parse(self, pdf_path: str) -> StatementData:
         text = self.extractor.extract_text_pdfplumber(pdf_path)
@@ -36,28 +74,16 @@ class AmexIndiaParser(BaseParser):
     
     def extract_amex_card_number(self, text: str) -> str:
         """Extract Amex card number (15 digits)"""
-        patterns = [
-            r'Membership Number.*?[Xx*]{4}[-\s]*[Xx*]{6}[-\s]*(\d{5})',
-            r'Card Number.*?[Xx*]{4}[-\s]*[Xx*]{6}[-\s]*(\d{5})',
-            r'[Xx*]{4}[-\s]*[Xx*]{6}[-\s]*(\d{5})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _CARD_NUMBER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_amex_billing_cycle(self, text: str) -> str:
         """Extract billing cycle from Amex statement"""
-        patterns = [
-            r'Statement Period.*?From\s+([A-Za-z]+\s+\d{1,2})\s+to\s+([A-Za-z]+\s+\d{1,2},?\s*\d{4})',
-            r'Statement Period.*?(\d{1,2}/\d{1,2}/\d{4})\s*to\s*(\d{1,2}/\d{1,2}/\d{4})',
-            r'Closing Date.*?([A-Za-z]+\s+\d{1,2},?\s*\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _BILLING_CYCLE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 if match.lastindex == 2:
                     return f"{match.group(1)} - {match.group(2)}"
@@ -67,43 +93,24 @@ class AmexIndiaParser(BaseParser):
     
     def extract_amex_due_date(self, text: str) -> str:
         """Extract payment due date"""
-        patterns = [
-            r'Minimum Payment Due.*?([A-Za-z]+\s+\d{1,2},?\s*\d{4})',
-            r'Payment Due Date.*?(\d{1,2}/\d{1,2}/\d{4})',
-            r'Due Date.*?(\d{1,2}/\d{1,2}/\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DUE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_amex_balance(self, text: str) -> float:
         """Extract total balance"""
-        patterns = [
-            r'Closing Balance Rs\s*([\d,]+\.?\d*)',
-            r'New Balance.*?Rs\s*([\d,]+\.?\d*)',
-            r'Total Amount Due.*?Rs\s*([\d,]+\.?\d*)',
-            r'Total Dues\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _BALANCE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
     
     def extract_amex_minimum(self, text: str) -> float:
         """Extract minimum payment"""
-        patterns = [
-            r'Min Payment Due Rs\s*([\d,]+\.?\d*)',
-            r'Minimum Payment Due.*?Rs\s*([\d,]+\.?\d*)',
-            r'Minimum Amount Due\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _MINIMUM_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
@@ -113,13 +120,8 @@ class AmexIndiaParser(BaseParser):
         transactions = []
         
         # Amex India format: Date Description Amount
-        patterns = [
-            r'([A-Za-z]{3}\s+\d{1,2})\s+([A-Z][A-Z0-9\s\-\.&]{3,50}?)\s+([\d,]+\.?\d*)',
-            r'(\d{1,2}/\d{1,2}/\d{4})\s+([A-Z][A-Z0-9\s\-\.&]{3,50}?)\s+([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.MULTILINE)
+        for pattern in _TRANSACTION_PATTERNS:
+            matches = pattern.findall(text)
             
             for match in matches[:10]:
                 try:
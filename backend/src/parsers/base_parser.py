@@ -1,8 +1,39 @@
+import io
 from abc import ABC, abstractmethod
 from models.statement import StatementData
 from utils.pdf_utils import PDFExtractor
 import re
 
+_CARD_LAST_FOUR_PATTERNS = [
+    # Standard formats
+    re.compile(r'[Xx]{4}\s*[Xx]{4}\s*[Xx]{4}\s*(\d{4})', re.IGNORECASE),
+    re.compile(r'\*{4}\s*\*{4}\s*\*{4}\s*(\d{4})', re.IGNORECASE),
+    re.compile(r'ending\s+in\s+(\d{4})', re.IGNORECASE),
+    re.compile(r'Account\s+Number:?\s*[Xx\*\-]*(\d{4})', re.IGNORECASE),
+    # Indian bank formats
+    re.compile(r'\d{4}\s*\d{2}[Xx]{2}\s*[Xx]{4}\s*(\d{3,4})', re.IGNORECASE),
+    re.compile(r'\d{6}[Xx]{6}(\d{4})', re.IGNORECASE),
+    re.compile(r'Card No:\s*\d+\s*[Xx]+\s*[Xx]+\s*(\d{3,4})', re.IGNORECASE),
+]
+
+_DATE_RANGE_PATTERNS = [
+    # Indian date formats
+    re.compile(r'(?:Statement Period|Billing Period|Statement Date):?\s*([\w\s]+\d{1,2},?\s*\d{4})\s*(?:to|-)\s*([\w\s]+\d{1,2},?\s*\d{4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2}/\d{1,2}/\d{2,4})\s*(?:to|-)\s*(\d{1,2}/\d{1,2}/\d{2,4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2}-[A-Za-z]{3}-\d{4})\s*(?:to|-|To)\s*(\d{1,2}-[A-Za-z]{3}-\d{4})', re.IGNORECASE),
+    re.compile(r'From\s+(\d{1,2}\s+[A-Za-z]+\s+\d{4})\s+to\s+(\d{1,2}\s+[A-Za-z]+\s+\d{4})', re.IGNORECASE),
+]
+
+_DUE_DATE_PATTERNS = [
+    re.compile(r'(?:Payment Due Date|Due Date|Payment Due):?\s*([\w\s]+\d{1,2},?\s*\d{4})', re.IGNORECASE),
+    re.compile(r'(?:Payment Due Date|Due Date):?\s*(\d{1,2}/\d{1,2}/\d{2,4})', re.IGNORECASE),
+    re.compile(r'Due Date\s*:\s*(\d{1,2}-[A-Za-z]{3}-\d{4})', re.IGNORECASE),
+]
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_TRAILING_MARKS_RE = re.compile(r'[\*\-]+$')
+
 class BaseParser(ABC):
     def __init__(self):
         self.extractor = PDFExtractor()
@@ -17,52 +48,30 @@ class BaseParser(ABC):
         """Parse the PDF and extract statement data"""
         pass
     
+    def parse_from_bytes(self, data: bytes) -> StatementData:
+        """Parse a PDF that has already been read into memory"""
+        return self.parse(io.BytesIO(data))
+    
     def extract_card_last_four(self, text: str) -> str:
         """Extract last 4 digits of card number"""
-        patterns = [
-            # Standard formats
-            r'[Xx]{4}\s*[Xx]{4}\s*[Xx]{4}\s*(\d{4})',
-            r'\*{4}\s*\*{4}\s*\*{4}\s*(\d{4})',
-            r'ending\s+in\s+(\d{4})',
-            r'Account\s+Number:?\s*[Xx\*\-]*(\d{4})',
-            # Indian bank formats
-            r'\d{4}\s*\d{2}[Xx]{2}\s*[Xx]{4}\s*(\d{3,4})',
-            r'\d{6}[Xx]{6}(\d{4})',
-            r'Card No:\s*\d+\s*[Xx]+\s*[Xx]+\s*(\d{3,4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _CARD_LAST_FOUR_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_date_range(self, text: str) -> str:
         """Extract billing cycle date range"""
-        patterns = [
-            # Indian date formats
-            r'(?:Statement Period|Billing Period|Statement Date):?\s*([\w\s]+\d{1,2},?\s*\d{4})\s*(?:to|-)\s*([\w\s]+\d{1,2},?\s*\d{4})',
-            r'(\d{1,2}/\d{1,2}/\d{2,4})\s*(?:to|-)\s*(\d{1,2}/\d{1,2}/\d{2,4})',
-            r'(\d{1,2}-[A-Za-z]{3}-\d{4})\s*(?:to|-|To)\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-            r'From\s+(\d{1,2}\s+[A-Za-z]+\s+\d{4})\s+to\s+(\d{1,2}\s+[A-Za-z]+\s+\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DATE_RANGE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return f"{match.group(1)} - {match.group(2)}"
         return "N/A"
     
     def extract_due_date(self, text: str) -> str:
         """Extract payment due date"""
-        patterns = [
-            r'(?:Payment Due Date|Due Date|Payment Due):?\s*([\w\s]+\d{1,2},?\s*\d{4})',
-            r'(?:Payment Due Date|Due Date):?\s*(\d{1,2}/\d{1,2}/\d{2,4})',
-            r'Due Date\s*:\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DUE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
@@ -70,10 +79,10 @@ class BaseParser(ABC):
     def clean_description(self, description: str) -> str:
         """Clean transaction description"""
         # Remove extra whitespace
-        description = re.sub(r'\s+', ' ', description)
+        description = _WHITESPACE_RE.sub(' ', description)
         
         # Remove trailing special characters
-        description = re.sub(r'[\*\-]+$', '', description)
+        description = _TRAILING_MARKS_RE.sub('', description)
         
         # Capitalize properly
         description = description.strip()
@@ -2,17 +2,50 @@ import re
 from models.statement import StatementData, Transaction
 from parsers.base_parser import BaseParser
 
+_CARD_NUMBER_PATTERNS = [
+    re.compile(r'Card No:\s*\d{4}\s*\d{2}[Xx]{2}\s*[Xx]{4}\s*(\d{4})', re.IGNORECASE),
+    re.compile(r'Card Number.*?[Xx*]{4}\s*[Xx*]{4}\s*[Xx*]{4}\s*(\d{4})', re.IGNORECASE),
+    re.compile(r'\d{4}\s*\d{2}XX\s*XXXX\s*(\d{3,4})', re.IGNORECASE),
+]
+
+_BILLING_CYCLE_PATTERNS = [
+    re.compile(r'Statement Date:\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE),
+    re.compile(r'Statement for.*?(\d{2}/\d{2}/\d{4})\s*to\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE),
+]
+
+_DUE_DATE_PATTERNS = [
+    re.compile(r'Payment Due Date\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE),
+    re.compile(r'Due Date\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE),
+]
+
+_BALANCE_PATTERNS = [
+    re.compile(r'Total Dues\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Total Amount Due.*?([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Current Dues\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_MINIMUM_PATTERNS = [
+    re.compile(r'Minimum Amount Due\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Minimum Payment\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_TRANSACTION_RE = re.compile(r'(\d{2}/\d{2}/\d{4})\s+([A-Z][A-Z0-9\s\-\.\*&]{3,50}?)\s+([\d,]+\.?\d*)', re.MULTILINE)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class HDFCParser(BaseParser):
+    # Issuer tokens searched for in the lowercased statement text
+    INDICATORS = [
+        'hdfc bank',
+        'hdfcbank',
+        'hdfc credit card',
+        'times card',
+        'timescard'
+    ]
+    
     def can_parse(self, text: str) -> bool:
-        indicators = [
-            'hdfc bank',
-            'hdfcbank',
-            'hdfc credit card',
-            'times card',
-            'timescard'
-        ]
         text_lower = text.lower()
-        return any(indicator in text_lower for indicator in indicators)
+        return any(indicator in text_lower for indicator in self.INDICATORS)
     
     def parse(self, pdf_path: str) -> StatementData:
         text = self.extractor.extract_text_pdfplumber(pdf_path)
@@ -36,27 +69,16 @@ class HDFCParser(BaseParser):
     
     def extract_hdfc_card_number(self, text: str) -> str:
         """Extract HDFC card last 4 digits"""
-        patterns = [
-            r'Card No:\s*\d{4}\s*\d{2}[Xx]{2}\s*[Xx]{4}\s*(\d{4})',
-            r'Card Number.*?[Xx*]{4}\s*[Xx*]{4}\s*[Xx*]{4}\s*(\d{4})',
-            r'\d{4}\s*\d{2}XX\s*XXXX\s*(\d{3,4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _CARD_NUMBER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_hdfc_billing_cycle(self, text: str) -> str:
         """Extract billing cycle"""
-        patterns = [
-            r'Statement Date:\s*(\d{2}/\d{2}/\d{4})',
-            r'Statement for.*?(\d{2}/\d{2}/\d{4})\s*to\s*(\d{2}/\d{2}/\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _BILLING_CYCLE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 if match.lastindex == 2:
                     return f"{match.group(1)} - {match.group(2)}"
@@ -65,40 +87,24 @@ class HDFCParser(BaseParser):
     
     def extract_hdfc_due_date(self, text: str) -> str:
         """Extract payment due date"""
-        patterns = [
-            r'Payment Due Date\s*(\d{2}/\d{2}/\d{4})',
-            r'Due Date\s*(\d{2}/\d{2}/\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DUE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_hdfc_balance(self, text: str) -> float:
         """Extract total balance"""
-        patterns = [
-            r'Total Dues\s*([\d,]+\.?\d*)',
-            r'Total Amount Due.*?([\d,]+\.?\d*)',
-            r'Current Dues\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _BALANCE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
     
     def extract_hdfc_minimum(self, text: str) -> float:
         """Extract minimum payment"""
-        patterns = [
-            r'Minimum Amount Due\s*([\d,]+\.?\d*)',
-            r'Minimum Payment\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _MINIMUM_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
@@ -108,8 +114,7 @@ class HDFCParser(BaseParser):
         transactions = []
         
         # HDFC format: Date Description Amount
-        pattern = r'(\d{2}/\d{2}/\d{4})\s+([A-Z][A-Z0-9\s\-\.\*&]{3,50}?)\s+([\d,]+\.?\d*)'
-        matches = re.findall(pattern, text, re.MULTILINE)
+        matches = _TRANSACTION_RE.findall(text)
         
         for match in matches[:10]:
             try:
@@ -117,7 +122,7 @@ class HDFCParser(BaseParser):
                 description = match[1].strip()
                 
                 # Clean description
-                description = re.sub(r'\s+', ' ', description)
+                description = _WHITESPACE_RE.sub(' ', description)
                 
                 # Skip certain entries
                 if any(skip in description.upper() for skip in ['PAYMENT', 'CREDIT', 'IGST', 'GST']):
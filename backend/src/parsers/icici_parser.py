@@ -2,16 +2,51 @@ import re
 from models.statement import StatementData, Transaction
 from parsers.base_parser import BaseParser
 
+_CARD_NUMBER_PATTERNS = [
+    re.compile(r'Card Number\s*:\s*\d{4}\s*[Xx]{4}\s*[Xx]{4}\s*(\d{4})', re.IGNORECASE),
+    re.compile(r'\d{4}\s*XXXX\s*XXXX\s*(\d{3,4})', re.IGNORECASE),
+    re.compile(r'Card Account No\s*(\d{4}\s*XXXX\s*XXXX\s*\d{3})', re.IGNORECASE),
+]
+
+_BILLING_CYCLE_PATTERNS = [
+    re.compile(r'Statement Date\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE | re.DOTALL),
+    re.compile(r'Statement Period.*?From\s*(\d{2}/\d{2}/\d{4})\s*to\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE | re.DOTALL),
+]
+
+_DUE_DATE_PATTERNS = [
+    re.compile(r'Due Date\s*:\s*(\d{2}/\d{2}/\d{4})', re.IGNORECASE),
+    re.compile(r'Payment.*?Due.*?(\d{2}/\d{2}/\d{4})', re.IGNORECASE),
+]
+
+_BALANCE_PATTERNS = [
+    re.compile(r'Your Total Amount Due\s*`?\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Total Amount Due\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Total Dues\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_MINIMUM_PATTERNS = [
+    re.compile(r'Minimum Amount Due\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Minimum Payment\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_TRANSACTION_RE = re.compile(r'(\d{2}/\d{2}/\d{4})\s+\d+\s+([A-Z][A-Za-z0-9\s\-\.\*&]{3,50}?)\s+([\d,]+\.?\d*)', re.MULTILINE)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_NON_DIGIT_RE = re.compile(r'[^0-9]')
+
 class ICICIParser(BaseParser):
+    # Issuer tokens searched for in the lowercased statement text
+    INDICATORS = [
+        'icici bank',
+        'icicibank',
+        'icici credit card',
+        'ICICI Bank Credit Cards'
+    ]
+    
     def can_parse(self, text: str) -> bool:
-        indicators = [
-            'icici bank',
-            'icicibank',
-            'icici credit card',
-            'ICICI Bank Credit Cards'
-        ]
         text_lower = text.lower()
-        return any(indicator in text_lower for indicator in indicators)
+        return any(indicator in text_lower for indicator in self.INDICATORS)
     
     def parse(self, pdf_path: str) -> StatementData:
         text = self.extractor.extract_text_pdfplumber(pdf_path)
@@ -35,31 +70,20 @@ class ICICIParser(BaseParser):
     
     def extract_icici_card_number(self, text: str) -> str:
         """Extract ICICI card last 4 digits"""
-        patterns = [
-            r'Card Number\s*:\s*\d{4}\s*[Xx]{4}\s*[Xx]{4}\s*(\d{4})',
-            r'\d{4}\s*XXXX\s*XXXX\s*(\d{3,4})',
-            r'Card Account No\s*(\d{4}\s*XXXX\s*XXXX\s*\d{3})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _CARD_NUMBER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 result = match.group(1)
                 # Extract only digits
-                digits = re.sub(r'[^0-9]', '', result)
+                digits = _NON_DIGIT_RE.sub('', result)
                 if digits:
                     return digits[-4:] if len(digits) >= 4 else digits
         return "N/A"
     
     def extract_icici_billing_cycle(self, text: str) -> str:
         """Extract billing cycle"""
-        patterns = [
-            r'Statement Date\s*(\d{2}/\d{2}/\d{4})',
-            r'Statement Period.*?From\s*(\d{2}/\d{2}/\d{4})\s*to\s*(\d{2}/\d{2}/\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _BILLING_CYCLE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 if match.lastindex == 2:
                     return f"{match.group(1)} - {match.group(2)}"
@@ -68,40 +92,24 @@ class ICICIParser(BaseParser):
     
     def extract_icici_due_date(self, text: str) -> str:
         """Extract payment due date"""
-        patterns = [
-            r'Due Date\s*:\s*(\d{2}/\d{2}/\d{4})',
-            r'Payment.*?Due.*?(\d{2}/\d{2}/\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DUE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_icici_balance(self, text: str) -> float:
         """Extract total balance"""
-        patterns = [
-            r'Your Total Amount Due\s*`?\s*([\d,]+\.?\d*)',
-            r'Total Amount Due\s*([\d,]+\.?\d*)',
-            r'Total Dues\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _BALANCE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
     
     def extract_icici_minimum(self, text: str) -> float:
         """Extract minimum payment"""
-        patterns = [
-            r'Minimum Amount Due\s*([\d,]+\.?\d*)',
-            r'Minimum Payment\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _MINIMUM_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
@@ -111,8 +119,7 @@ class ICICIParser(BaseParser):
         transactions = []
         
         # ICICI format: Date Ref.Number Description Amount
-        pattern = r'(\d{2}/\d{2}/\d{4})\s+\d+\s+([A-Z][A-Za-z0-9\s\-\.\*&]{3,50}?)\s+([\d,]+\.?\d*)'
-        matches = re.findall(pattern, text, re.MULTILINE)
+        matches = _TRANSACTION_RE.findall(text)
         
         for match in matches[:10]:
             try:
@@ -120,7 +127,7 @@ class ICICIParser(BaseParser):
                 description = match[1].strip()
                 
                 # Clean description
-                description = re.sub(r'\s+', ' ', description)
+                description = _WHITESPACE_RE.sub(' ', description)
                 
                 # Skip certain entries
                 skip_terms = ['PAYMENT', 'CREDIT CARD PAYMENT', 'INFINITY PAYMENT', 
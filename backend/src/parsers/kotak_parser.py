@@ -2,16 +2,49 @@ import re
 from models.statement import StatementData, Transaction
 from parsers.base_parser import BaseParser
 
+_CARD_NUMBER_PATTERNS = [
+    re.compile(r'Card No:\s*\d{6}[Xx]{6}(\d{4})', re.IGNORECASE),
+    re.compile(r'\d{6}XXXXXX(\d{4})', re.IGNORECASE),
+    re.compile(r'Card.*?\d{4}[Xx*]{2}XX\s*XXXX\s*(\d{4})', re.IGNORECASE),
+]
+
+_BILLING_CYCLE_PATTERNS = [
+    re.compile(r'Statement Period\s*(\d{1,2}-[A-Za-z]{3}-\d{4})\s*To\s*(\d{1,2}-[A-Za-z]{3}-\d{4})', re.IGNORECASE),
+    re.compile(r'Statement Date\s*(\d{1,2}-[A-Za-z]{3}-\d{4})', re.IGNORECASE),
+]
+
+_DUE_DATE_PATTERNS = [
+    re.compile(r'Due Date\s*(\d{1,2}-[A-Za-z]{3}-\d{4})', re.IGNORECASE),
+    re.compile(r'Payment Due Date\s*(\d{1,2}-[A-Za-z]{3}-\d{4})', re.IGNORECASE),
+]
+
+_BALANCE_PATTERNS = [
+    re.compile(r'Total Amount Due\s*\(Rs\.\)\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Total Dues\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Amount Due\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_MINIMUM_PATTERNS = [
+    re.compile(r'Minimum Amount Due\s*([\d,]+\.?\d*)', re.IGNORECASE),
+    re.compile(r'Minimum Payment\s*([\d,]+\.?\d*)', re.IGNORECASE),
+]
+
+_TRANSACTION_RE = re.compile(r'(\d{2}/\d{2}/\d{4})\s+([A-Z][A-Za-z0-9\s\-\.\*&]{3,50}?)\s+[A-Za-z]+\s+([\d,]+\.?\d*)', re.MULTILINE)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class KotakParser(BaseParser):
+    # Issuer tokens searched for in the lowercased statement text
+    INDICATORS = [
+        'kotak',
+        'kotak mahindra bank',
+        'kotak credit card',
+        'kotak bank'
+    ]
+    
     def can_parse(self, text: str) -> bool:
-        indicators = [
-            'kotak',
-            'kotak mahindra bank',
-            'kotak credit card',
-            'kotak bank'
-        ]
         text_lower = text.lower()
-        return any(indicator in text_lower for indicator in indicators)
+        return any(indicator in text_lower for indicator in self.INDICATORS)
     
     def parse(self, pdf_path: str) -> StatementData:
         text = self.extractor.extract_text_pdfplumber(pdf_path)
@@ -35,27 +68,16 @@ class KotakParser(BaseParser):
     
     def extract_kotak_card_number(self, text: str) -> str:
         """Extract Kotak card last 4 digits"""
-        patterns = [
-            r'Card No:\s*\d{6}[Xx]{6}(\d{4})',
-            r'\d{6}XXXXXX(\d{4})',
-            r'Card.*?\d{4}[Xx*]{2}XX\s*XXXX\s*(\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _CARD_NUMBER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_kotak_billing_cycle(self, text: str) -> str:
         """Extract billing cycle"""
-        patterns = [
-            r'Statement Period\s*(\d{1,2}-[A-Za-z]{3}-\d{4})\s*To\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-            r'Statement Date\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _BILLING_CYCLE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 if match.lastindex == 2:
                     return f"{match.group(1)} - {match.group(2)}"
@@ -64,40 +86,24 @@ class KotakParser(BaseParser):
     
     def extract_kotak_due_date(self, text: str) -> str:
         """Extract payment due date"""
-        patterns = [
-            r'Due Date\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-            r'Payment Due Date\s*(\d{1,2}-[A-Za-z]{3}-\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DUE_DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "N/A"
     
     def extract_kotak_balance(self, text: str) -> float:
         """Extract total balance"""
-        patterns = [
-            r'Total Amount Due\s*\(Rs\.\)\s*([\d,]+\.?\d*)',
-            r'Total Dues\s*([\d,]+\.?\d*)',
-            r'Amount Due\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _BALANCE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
     
     def extract_kotak_minimum(self, text: str) -> float:
         """Extract minimum payment"""
-        patterns = [
-            r'Minimum Amount Due\s*([\d,]+\.?\d*)',
-            r'Minimum Payment\s*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _MINIMUM_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self.extractor.extract_amount(match.group(1))
         return 0.0
@@ -107,8 +113,7 @@ class KotakParser(BaseParser):
         transactions = []
         
         # Kotak format: Date Transaction Details Spends Area Amount
-        pattern = r'(\d{2}/\d{2}/\d{4})\s+([A-Z][A-Za-z0-9\s\-\.\*&]{3,50}?)\s+[A-Za-z]+\s+([\d,]+\.?\d*)'
-        matches = re.findall(pattern, text, re.MULTILINE)
+        matches = _TRANSACTION_RE.findall(text)
         
         for match in matches[:10]:
             try:
@@ -116,7 +121,7 @@ class KotakParser(BaseParser):
                 description = match[1].strip()
                 
                 # Clean description
-                description = re.sub(r'\s+', ' ', description)
+                description = _WHITESPACE_RE.sub(' ', description)
                 
                 # Skip payment entries
                 if 'PAYMENT' in description.upper() or 'NEFT' in description.upper():
@@ -2,16 +2,35 @@ import re
 from models.statement import StatementData, Transaction
 from parsers.base_parser import BaseParser
 
+_CARD_NUMBER_PATTERNS = [
+    re.compile(r'Account Number\s*:\s*(\d{11,17})', re.IGNORECASE),
+    re.compile(r'A/c\s*No\.?\s*:\s*(\d{11,17})', re.IGNORECASE),
+]
+
+_BILLING_CYCLE_PATTERNS = [
+    re.compile(r'Account Statement from\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})\s*to\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})', re.IGNORECASE),
+    re.compile(r'Statement.*?(\d{1,2}/\d{1,2}/\d{4})\s*to\s*(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE),
+    re.compile(r'Date\s*:\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})', re.IGNORECASE),
+]
+
+_BALANCE_RE = re.compile(r'Balance.*?([\d,]+\.?\d*)', re.IGNORECASE)
+
+_TRANSACTION_RE = re.compile(r'(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})\s+\d{1,2}\s+[A-Za-z]{3}\s+\d{4}\s+([A-Z][A-Za-z0-9\s\-\.\*&]{3,50}?)\s+[\w/\-]+\s+([\d,]+\.?\d*)', re.MULTILINE)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class SBIParser(BaseParser):
+    # Issuer tokens searched for in the lowercased statement text
+    INDICATORS = [
+        'state bank of india',
+        'sbi',
+        'sbichq',
+        'sbin'
+    ]
+    
     def can_parse(self, text: str) -> bool:
-        indicators = [
-            'state bank of india',
-            'sbi',
-            'sbichq',
-            'sbin'
-        ]
         text_lower = text.lower()
-        return any(indicator in text_lower for indicator in indicators)
+        return any(indicator in text_lower for indicator in self.INDICATORS)
     
     def parse(self, pdf_path: str) -> StatementData:
         text = self.extractor.extract_text_pdfplumber(pdf_path)
@@ -35,13 +54,8 @@ class SBIParser(BaseParser):
     
     def extract_sbi_card_number(self, text: str) -> str:
         """Extract SBI account number"""
-        patterns = [
-            r'Account Number\s*:\s*(\d{11,17})',
-            r'A/c\s*No\.?\s*:\s*(\d{11,17})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _CARD_NUMBER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 number = match.group(1)
                 return number[-4:] if len(number) >= 4 else number
@@ -49,14 +63,8 @@ class SBIParser(BaseParser):
     
     def extract_sbi_billing_cycle(self, text: str) -> str:
         """Extract statement period"""
-        patterns = [
-            r'Account Statement from\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})\s*to\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})',
-            r'Statement.*?(\d{1,2}/\d{1,2}/\d{4})\s*to\s*(\d{1,2}/\d{1,2}/\d{4})',
-            r'Date\s*:\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _BILLING_CYCLE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 if match.lastindex == 2:
                     return f"{match.group(1)} - {match.group(2)}"
@@ -66,8 +74,7 @@ class SBIParser(BaseParser):
     def extract_sbi_balance(self, text: str) -> float:
         """Extract balance"""
         # Look for the last balance in the statement
-        pattern = r'Balance.*?([\d,]+\.?\d*)'
-        matches = re.findall(pattern, text, re.IGNORECASE)
+        matches = _BALANCE_RE.findall(text)
         
         if matches:
             # Return the last balance found
@@ -79,8 +86,7 @@ class SBIParser(BaseParser):
         transactions = []
         
         # SBI format: Date Value Date Description Ref No./Cheque No. Debit Credit Balance
-        pattern = r'(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})\s+\d{1,2}\s+[A-Za-z]{3}\s+\d{4}\s+([A-Z][A-Za-z0-9\s\-\.\*&]{3,50}?)\s+[\w/\-]+\s+([\d,]+\.?\d*)'
-        matches = re.findall(pattern, text, re.MULTILINE)
+        matches = _TRANSACTION_RE.findall(text)
         
         for match in matches[:10]:
             try:
@@ -88,7 +94,7 @@ class SBIParser(BaseParser):
                 description = match[1].strip()
                 
                 # Clean description
-                description = re.sub(r'\s+', ' ', description)
+                description = _WHITESPACE_RE.sub(' ', description)
                 
                 # Skip certain entries
                 skip_terms = ['TRANSFER', 'PAYMENT', 'CREDIT', 'WITHDRAWAL', 'NEFT']
@@ -4,9 +4,11 @@ Quick Test Script
 Run quick tests on your parsers
 """
 
+import io
 import sys
 import os
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from colorama import init, Fore, Style
 
 # Initialize colorama for colored output
@@ -29,6 +31,44 @@ def print_warning(text):
 def print_info(text):
     print(f"{Fore.BLUE}ℹ️  {text}{Style.RESET_ALL}")
 
+def _report_statement(statement):
+    """Print extracted fields for a parsed statement and return whether all were found"""
+    print_header("EXTRACTED DATA")
+    
+    results = {
+        "Issuer": statement.issuer,
+        "Card Last 4": statement.card_last_four,
+        "Billing Cycle": statement.billing_cycle,
+        "Due Date": statement.payment_due_date,
+        "Total Balance": f"₹{statement.total_balance:,.2f}",
+        "Minimum Payment": f"₹{statement.minimum_payment:,.2f}",
+        "Transactions": len(statement.transactions or [])
+    }
+    
+    # Check each field
+    all_good = True
+    for field, value in results.items():
+        if value in ["N/A", "0.00", 0]:
+            print_warning(f"{field:20}: {value}")
+            all_good = False
+        else:
+            print_success(f"{field:20}: {value}")
+    
+    # Show transactions
+    if statement.transactions:
+        print(f"\n{Fore.BLUE}Top Transactions:{Style.RESET_ALL}")
+        for i, txn in enumerate(statement.transactions[:3], 1):
+            print(f"  {i}. {txn.date:12} {txn.description[:35]:35} ₹{txn.amount:>10,.2f}")
+    
+    # Summary
+    print()
+    if all_good:
+        print_success("All fields extracted successfully!")
+        return True
+    else:
+        print_warning("Some fields missing or incorrect")
+        return False
+
 def test_single_pdf(pdf_path):
     """Quick test on a single PDF"""
     from utils.pdf_utils import PDFExtractor
@@ -40,11 +80,11 @@ def test_single_pdf(pdf_path):
     
     print_header(f"TESTING: {os.path.basename(pdf_path)}")
     
-    # Extract text
+    # Extract text (cached per path, so parser.parse below reuses it)
     print_info("Extracting PDF text...")
     try:
         extractor = PDFExtractor()
-        text = extractor.extract_text_pdfplumber(pdf_path)
+        text = extractor.extract_text_pdfplumber(str(pdf_path))
         print_success(f"Extracted {len(text)} characters")
     except Exception as e:
         print_error(f"Failed to extract text: {e}")
@@ -76,48 +116,36 @@ def test_single_pdf(pdf_path):
     # Parse PDF
     print_info("Parsing statement...")
     try:
-        statement = parser.parse(pdf_path)
+        statement = parser.parse(str(pdf_path))
         print_success("Parse completed!")
     except Exception as e:
         print_error(f"Parse failed: {e}")
         return False
     
-    # Display results
-    print_header("EXTRACTED DATA")
-    
-    results = {
-        "Issuer": statement.issuer,
-        "Card Last 4": statement.card_last_four,
-        "Billing Cycle": statement.billing_cycle,
-        "Due Date": statement.payment_due_date,
-        "Total Balance": f"₹{statement.total_balance:,.2f}",
-        "Minimum Payment": f"₹{statement.minimum_payment:,.2f}",
-        "Transactions": len(statement.transactions or [])
-    }
-    
-    # Check each field
-    all_good = True
-    for field, value in results.items():
-        if value in ["N/A", "0.00", 0]:
-            print_warning(f"{field:20}: {value}")
-            all_good = False
-        else:
-            print_success(f"{field:20}: {value}")
+    return _report_statement(statement)
+
+def parse_pdf(pdf_path):
+    """Detect the issuer and parse a PDF (runs in a worker process)"""
+    from utils.pdf_utils import PDFExtractor
+    from parsers.amex_india_parser import AmexIndiaParser
+    from parsers.hdfc_parser import HDFCParser
+    from parsers.icici_parser import ICICIParser
+    from parsers.kotak_parser import KotakParser
+    from parsers.sbi_parser import SBIParser
     
-    # Show transactions
-    if statement.transactions:
-        print(f"\n{Fore.BLUE}Top Transactions:{Style.RESET_ALL}")
-        for i, txn in enumerate(statement.transactions[:3], 1):
-            print(f"  {i}. {txn.date:12} {txn.description[:35]:35} ₹{txn.amount:>10,.2f}")
+    text = PDFExtractor().extract_text_pdfplumber(pdf_path)
+    parsers = [
+        AmexIndiaParser(),
+        HDFCParser(),
+        ICICIParser(),
+        KotakParser(),
+        SBIParser()
+    ]
     
-    # Summary
-    print()
-    if all_good:
-        print_success("All fields extracted successfully!")
-        return True
-    else:
-        print_warning("Some fields missing or incorrect")
-        return False
+    for p in parsers:
+        if p.can_parse(text):
+            return p.__class__.__name__, p.parse(pdf_path)
+    return None, None
 
 def test_directory(directory):
     """Test all PDFs in a directory"""
@@ -129,10 +157,31 @@ def test_directory(directory):
     
     print_header(f"TESTING {len(pdf_files)} PDFs")
     
+    cpu_workers = min(os.cpu_count() or 1, len(pdf_files))
+    
     results = []
-    for pdf_file in pdf_files:
-        success = test_single_pdf(str(pdf_file))
-        results.append((pdf_file.name, success))
+    with ProcessPoolExecutor(max_workers=cpu_workers) as cpu_pool:
+        # Workers get paths, so detection and parsing share the extractor's text cache
+        parses = {cpu_pool.submit(parse_pdf, str(pdf_file)): pdf_file for pdf_file in pdf_files}
+        
+        # Report in arrival order instead of waiting for the whole batch
+        for future in as_completed(parses):
+            pdf_file = parses[future]
+            print_header(f"TESTING: {pdf_file.name}")
+            try:
+                parser_name, statement = future.result()
+            except Exception as e:
+                print_error(f"Parse failed: {e}")
+                results.append((pdf_file.name, False))
+                continue
+            
+            if statement is None:
+                print_error("No parser found - unsupported bank")
+                results.append((pdf_file.name, False))
+                continue
+            
+            print_success(f"Detected: {parser_name}")
+            results.append((pdf_file.name, _report_statement(statement)))
     
     # Summary
     print_header("SUMMARY")
@@ -247,21 +296,27 @@ def view_raw_text(pdf_path):
     
     print_header(f"RAW TEXT: {os.path.basename(pdf_path)}")
     
-    extractor = PDFExtractor()
-    text = extractor.extract_text_pdfplumber(pdf_path)
+    # Keep only the preview in memory; the rest is counted and discarded
+    head = io.StringIO()
+    total = 0
+    for page_text in PDFExtractor.iter_pages_text(pdf_path):
+        total += len(page_text)
+        if head.tell() < 2000:
+            head.write(page_text[:2000 - head.tell()])
     
-    print_info(f"Total length: {len(text)} characters\n")
+    print_info(f"Total length: {total} characters\n")
     
     # Show first 2000 characters
-    print(text[:2000])
-    print(f"\n{Fore.YELLOW}(Showing first 2000 of {len(text)} characters){Style.RESET_ALL}")
+    print(head.getvalue())
+    print(f"\n{Fore.YELLOW}(Showing first 2000 of {total} characters){Style.RESET_ALL}")
     
     # Offer to save
     save = input("\nSave full text to file? (y/n): ").strip().lower()
     if save == 'y':
         output_file = f"{os.path.splitext(pdf_path)[0]}_raw_text.txt"
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(text)
+            for page_text in PDFExtractor.iter_pages_text(pdf_path):
+                f.write(page_text)
         print_success(f"Saved to {output_file}")
 
 def main():
@@ -3,10 +3,32 @@ Robust Universal Parser
 Handles multiple PDF formats and extraction methods
 """
 
+import io
+import os
 import re
+import functools
 import pdfplumber
 import pandas as pd
-from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Union
+
+# Payment/credit descriptions to skip (plain substring match, e.g. PAYMENTS also hits)
+_SKIP_RE = re.compile(r'PAYMENT|CREDIT|NEFT|IMPS|THANK YOU')
+_WS_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=4)
+def _read_bytes_keyed(path: str, mtime_ns: int, size: int) -> bytes:
+    """mtime_ns and size are part of the key, so a rewritten file is read again"""
+    return Path(path).read_bytes()
+
+
+def _read_bytes_cached(pdf_path: str) -> bytes:
+    """Read a PDF from disk once so repeated passes share the same buffer"""
+    path = os.path.abspath(pdf_path)
+    st = os.stat(path)
+    return _read_bytes_keyed(path, st.st_mtime_ns, st.st_size)
+
 
 class RobustExtractor:
     """Enhanced extractor with multiple fallback strategies"""
@@ -14,8 +36,8 @@ class RobustExtractor:
     def __init__(self):
         self.debug = False
     
-    def extract_all_methods(self, pdf_path: str) -> Dict:
-        """Try multiple extraction methods"""
+    def extract_all_methods(self, pdf_path: Union[str, bytes]) -> Dict:
+        """Try multiple extraction methods (accepts a path or raw PDF bytes)"""
         result = {
             'text_simple': '',
             'text_layout': '',
@@ -24,7 +46,9 @@ class RobustExtractor:
             'all_text_blocks': []
         }
         
-        with pdfplumber.open(pdf_path) as pdf:
+        data = pdf_path if isinstance(pdf_path, bytes) else _read_bytes_cached(str(pdf_path))
+        
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
             all_text_simple = []
             all_text_layout = []
             
@@ -198,7 +222,7 @@ class RobustExtractor:
             for match in matches:
                 try:
                     date = match[0].strip()
-                    description = re.sub(r'\s+', ' ', match[1].strip())
+                    description = _WS_RE.sub(' ', match[1]).strip()
                     amount_str = match[2].strip()
                     
                     # Skip if description is too short or looks like a header
@@ -206,8 +230,8 @@ class RobustExtractor:
                         continue
                     
                     # Skip payments/credits
-                    skip_terms = ['PAYMENT', 'CREDIT', 'NEFT', 'IMPS', 'THANK YOU']
-                    if any(term in description.upper() for term in skip_terms):
+                    desc_upper = description.upper()
+                    if _SKIP_RE.search(desc_upper):
                         continue
                     
                     amount = self._parse_amount(amount_str)
@@ -3,24 +3,63 @@ Enhanced SBI (State Bank of India) Parser with Table-Aware Extraction
 """
 
 import re
+import functools
 import pandas as pd
 from typing import List, Dict, Optional
 from models.statement import StatementData, Transaction
-from utils.table_aware_extractor import TableAwarePDFExtractor
+from utils.table_aware_extractor import shared_extractor
+from utils.amount_jit import jit_parse_amount
+
+_ACCT_PATTERNS = [
+    re.compile(r'Account Number\s*:\s*(\d{11,17})', re.IGNORECASE),
+    re.compile(r'A/c\s*No\.?\s*:\s*(\d{11,17})', re.IGNORECASE),
+    re.compile(r'Account No\s*:\s*(\d{11,17})', re.IGNORECASE),
+]
+
+_PERIOD_PATTERNS = [
+    re.compile(r'Account Statement from\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})\s*to\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})', re.IGNORECASE),
+    re.compile(r'Statement.*?(\d{1,2}/\d{1,2}/\d{4})\s*to\s*(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE),
+    re.compile(r'Date\s*:\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})', re.IGNORECASE),
+]
+
+_BAL_PATTERN = re.compile(r'(?:Closing Balance|Balance).*?([\d,]+\.?\d*)', re.IGNORECASE)
+
+# Bank indicators ('sbi' as a substring also covers 'sbichq' and 'sbin')
+_SBI_RE = re.compile(r'state bank of india|sbi')
+
+# Single-char currency symbols, whitespace and thousands separators; "Rs" is
+# removed afterwards as a whole token (a [Rs] char class would also eat a lone R/s)
+_AMT_TRANS = str.maketrans('', '', '₹$ \t\n\r,')
+_NUMERIC_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')
+
+# Transfers/payments are not spend; case-insensitive so descriptions need no upper()
+_SKIP_RE = re.compile(r'TRANSFER TO|NEFT|IMPS|UPI|PAYMENT', re.IGNORECASE)
+
+# Transaction table header scoring
+_DATE_RE = re.compile(r'date', re.IGNORECASE)
+_DESC_RE = re.compile(r'description|particular|narration', re.IGNORECASE)
+_MONEY_RE = re.compile(r'debit|credit|withdrawal', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_pattern(keywords: tuple) -> re.Pattern:
+    """Single case-insensitive alternation for a keyword list"""
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+
 
 class SBITableParser:
     def __init__(self):
-        self.extractor = TableAwarePDFExtractor()
+        self.extractor = shared_extractor()
     
-    def can_parse(self, text: str) -> bool:
-        indicators = [
-            'state bank of india',
-            'sbi',
-            'sbichq',
-            'sbin'
-        ]
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in indicators)
+    def can_parse(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """
+        Detect an SBI statement
+        Callers trying several parsers can pass text_lower (e.g. text[:4096].lower())
+        so the text is only lowercased once
+        """
+        if text_lower is None:
+            text_lower = text.lower()
+        return bool(_SBI_RE.search(text_lower))
     
     def parse(self, pdf_path: str) -> StatementData:
         """Parse SBI statement using table-aware extraction"""
@@ -46,40 +85,32 @@ class SBITableParser:
             transactions=transactions[-5:] if len(transactions) >= 5 else transactions  # Last 5 transactions
         )
     
+    def _top_text(self, extraction: Dict) -> str:
+        """All 'top' header regions joined, so each pattern runs once"""
+        return '\n'.join(text for region_name, text in extraction['text_by_region'].items() if 'top' in region_name)
+    
     def _extract_account_number(self, extraction: Dict) -> str:
         """Extract account number"""
-        for region_name, text in extraction['text_by_region'].items():
-            if 'top' in region_name:
-                patterns = [
-                    r'Account Number\s*:\s*(\d{11,17})',
-                    r'A/c\s*No\.?\s*:\s*(\d{11,17})',
-                    r'Account No\s*:\s*(\d{11,17})',
-                ]
-                
-                for pattern in patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    if match:
-                        number = match.group(1)
-                        return number[-4:] if len(number) >= 4 else number
+        top_text = self._top_text(extraction)
+        
+        for pattern in _ACCT_PATTERNS:
+            match = pattern.search(top_text)
+            if match:
+                number = match.group(1)
+                return number[-4:] if len(number) >= 4 else number
         
         return "N/A"
     
     def _extract_statement_period(self, extraction: Dict) -> str:
         """Extract statement period"""
-        for region_name, text in extraction['text_by_region'].items():
-            if 'top' in region_name:
-                patterns = [
-                    r'Account Statement from\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})\s*to\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})',
-                    r'Statement.*?(\d{1,2}/\d{1,2}/\d{4})\s*to\s*(\d{1,2}/\d{1,2}/\d{4})',
-                    r'Date\s*:\s*(\d{1,2}\s+[A-Za-z]{3}\s+\d{4})',
-                ]
-                
-                for pattern in patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    if match:
-                        if match.lastindex == 2:
-                            return f"{match.group(1)} - {match.group(2)}"
-                        return f"Statement date: {match.group(1)}"
+        top_text = self._top_text(extraction)
+        
+        for pattern in _PERIOD_PATTERNS:
+            match = pattern.search(top_text)
+            if match:
+                if match.lastindex == 2:
+                    return f"{match.group(1)} - {match.group(2)}"
+                return f"Statement date: {match.group(1)}"
         
         return "N/A"
     
@@ -93,18 +124,16 @@ class SBITableParser:
             balance_col = self._find_column_by_keywords(df, ['balance', 'closing balance'])
             
             if balance_col:
-                # Get last non-null balance
-                for idx in reversed(df.index):
-                    balance_str = str(df.at[idx, balance_col])
-                    if balance_str and balance_str != 'nan':
-                        amount = self._parse_amount(balance_str)
-                        if amount > 0:
-                            return amount
+                # Get last positive balance in one vectorized pass
+                column = df.iloc[:, list(df.columns).index(balance_col)]
+                amounts = self._parse_amount_series(column)
+                amounts = amounts[amounts > 0]
+                if len(amounts):
+                    return float(amounts.iloc[-1])
         
         # Fallback to text search
         for region_name, text in extraction['text_by_region'].items():
-            pattern = r'(?:Closing Balance|Balance).*?([\d,]+\.?\d*)'
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = _BAL_PATTERN.search(text)
             if match:
                 return self._parse_amount(match.group(1))
         
@@ -129,43 +158,36 @@ class SBITableParser:
         if not date_col or not desc_col:
             return transactions
         
-        # Extract transactions (prefer debits, but include credits if no debits)
-        for idx, row in txn_table.iterrows():
-            try:
-                date = str(row[date_col]).strip()
-                description = str(row[desc_col]).strip()
-                
-                # Skip headers
-                if 'date' in date.lower() or 'nan' in date.lower() or len(date) < 5:
-                    continue
-                
-                if len(description) < 3:
-                    continue
-                
-                # Try to get debit amount first
-                amount = 0.0
-                if debit_col:
-                    debit_str = str(row[debit_col]).strip()
-                    amount = self._parse_amount(debit_str)
-                
-                # If no debit, try credit
-                if amount == 0.0 and credit_col:
-                    credit_str = str(row[credit_col]).strip()
-                    amount = self._parse_amount(credit_str)
-                
-                if amount > 0:
-                    # Skip certain entries
-                    skip_terms = ['TRANSFER TO', 'NEFT', 'IMPS', 'UPI', 'PAYMENT']
-                    if any(skip in description.upper() for skip in skip_terms):
-                        continue
-                    
-                    transactions.append(Transaction(
-                        date=date,
-                        description=description,
-                        amount=amount
-                    ))
-            except:
-                continue
+        # Keep the first of any duplicated headers so each lookup yields a Series
+        txn_table = txn_table.loc[:, ~txn_table.columns.duplicated()]
+        
+        date_s = txn_table[date_col].astype(str).str.strip()
+        desc_s = txn_table[desc_col].astype(str).str.strip()
+        
+        # Skip headers, blank dates and short descriptions
+        valid = (
+            (date_s.str.len() >= 5)
+            & ~date_s.str.lower().str.contains('date|nan', regex=True)
+            & (desc_s.str.len() >= 3)
+        )
+        
+        # Prefer debits, but fall back to credits where there is no debit
+        amounts = pd.Series(0.0, index=txn_table.index)
+        if debit_col:
+            amounts = self._parse_amount_series(txn_table[debit_col])
+        if credit_col:
+            amounts = amounts.where(amounts != 0, self._parse_amount_series(txn_table[credit_col]))
+        
+        # Skip certain entries
+        skipped = desc_s.str.contains(_SKIP_RE)
+        
+        mask = valid & (amounts > 0) & ~skipped
+        for date, description, amount in zip(date_s[mask], desc_s[mask], amounts[mask]):
+            transactions.append(Transaction(
+                date=date,
+                description=description,
+                amount=float(amount)
+            ))
         
         return transactions
     
@@ -181,14 +203,15 @@ class SBITableParser:
                 continue
             
             score = 0
-            headers = [str(col).lower() for col in df.columns]
+            # One newline-joined string so each header group is a single scan
+            headers = '\n'.join(str(col) for col in df.columns)
             
             # Score headers
-            if any('date' in h for h in headers):
+            if _DATE_RE.search(headers):
                 score += 2
-            if any('description' in h or 'particular' in h or 'narration' in h for h in headers):
+            if _DESC_RE.search(headers):
                 score += 2
-            if any('debit' in h or 'credit' in h or 'withdrawal' in h for h in headers):
+            if _MONEY_RE.search(headers):
                 score += 2
             
             if len(df) > 5:
@@ -206,25 +229,30 @@ class SBITableParser:
     
     def _find_column_by_keywords(self, df: pd.DataFrame, keywords: List[str]) -> Optional[str]:
         """Find column matching keywords"""
-        for col in df.columns:
-            col_lower = str(col).lower()
-            for keyword in keywords:
-                if keyword in col_lower:
-                    return col
-        return None
+        pattern = _keyword_pattern(tuple(keywords))
+        return next((col for col in df.columns if pattern.search(str(col))), None)
+    
+    def _parse_amount_series(self, column: pd.Series) -> pd.Series:
+        """Parse a column of amount strings, treating blanks and junk as 0"""
+        # strip() also covers NBSP and other Unicode whitespace the table leaves at the edges
+        cleaned = column.astype(str).str.strip().str.translate(_AMT_TRANS).str.replace('Rs', '', regex=False)
+        return pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
     
     def _parse_amount(self, amount_str: str) -> float:
         """Parse amount string"""
         if not amount_str or amount_str == 'nan':
             return 0.0
         
-        cleaned = re.sub(r'[₹$Rs\s]', '', amount_str)
-        cleaned = cleaned.replace(',', '')
+        # Numba-compiled byte scanner when available (batch runs)
+        if jit_parse_amount is not None:
+            return jit_parse_amount(amount_str)
+        
+        cleaned = amount_str.strip().translate(_AMT_TRANS).replace('Rs', '')
         
-        try:
-            return float(cleaned)
-        except:
+        # Validate up front so blank/junk cells never raise inside float()
+        if not _NUMERIC_RE.fullmatch(cleaned):
             return 0.0
+        return float(cleaned)
 
 
 if __name__ == "__main__":
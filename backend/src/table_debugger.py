@@ -3,15 +3,116 @@ Table Extraction Debugger
 Visualize and debug table extraction issues
 """
 
+import io
+import os
+import hashlib
+import pickle
 import pdfplumber
+import numpy as np
 import pandas as pd
+from pathlib import Path
 from typing import List, Dict
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    # Optional: without pyarrow, CSVs go through pandas and --parquet is unavailable
+    pa = None
+
+CACHE_DIR = Path(".cache")
+
+
+def _extract_pages(data: bytes, page_nums: List[int], compare_text: bool) -> Dict:
+    """
+    Extract page info and tables for a subset of pages
+    Opens a private handle on the PDF bytes, so it is safe to run in a worker
+    """
+    extraction = {'pages': {}, 'tables': {}}
+    
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page_num in page_nums:
+            page = pdf.pages[page_num]
+            page_info = {
+                'width': page.width,
+                'height': page.height,
+                'text_simple': page.extract_text()
+            }
+            if compare_text:
+                # page.chars is parsed once and reused by all three passes
+                page_info['text_layout'] = page.extract_text(layout=True)
+                page_info['text_tolerant'] = page.extract_text(x_tolerance=3, y_tolerance=3)
+            extraction['pages'][page_num] = page_info
+            
+            for table_idx, table in enumerate(page.extract_tables()):
+                extraction['tables'][(page_num, table_idx)] = table
+    
+    return extraction
+
 
 class TableDebugger:
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, compare_text: bool = False):
         self.pdf_path = pdf_path
-        self.pdf = None
+        # Layout/tolerant text passes are costly; only run them when comparing
+        self.compare_text = compare_text
+        self._extraction = None
+    
+    def _load_tables(self) -> Dict:
+        """
+        Extract page info and tables once, cached on disk by PDF content hash
+        Returns {'pages': {page_num: {...}}, 'tables': {(page_num, table_idx): table}}
+        Memoized on the instance so every sub-command in a run shares one load
+        """
+        if self._extraction is not None:
+            return self._extraction
+        
+        with open(self.pdf_path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        cache_file = CACHE_DIR / f"{digest}.pkl"
+        
+        if cache_file.exists():
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            # A cache written without --compare-text lacks the extra text variants
+            if not self.compare_text or all('text_layout' in p for p in cached['pages'].values()):
+                self._extraction = cached
+                return cached
+        
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            page_count = len(pdf.pages)
+        
+        # Fan pages out across workers (pdfminer is pure Python, so processes
+        # rather than threads); each worker gets a strided slice of pages
+        workers = min(os.cpu_count() or 1, page_count)
+        if workers > 1:
+            chunks = [list(range(page_count))[i::workers] for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parts = list(executor.map(_extract_pages, [data] * workers, chunks, [self.compare_text] * workers))
+        else:
+            parts = [_extract_pages(data, list(range(page_count)), self.compare_text)]
+        
+        # Merge back in page order
+        pages = {k: v for part in parts for k, v in part['pages'].items()}
+        tables = {k: v for part in parts for k, v in part['tables'].items()}
+        extraction = {
+            'pages': dict(sorted(pages.items())),
+            'tables': dict(sorted(tables.items()))
+        }
+        
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump(extraction, f)
+        
+        self._extraction = extraction
+        return extraction
+    
+    def _page_tables(self, extraction: Dict, page_num: int) -> List[List[List]]:
+        """Tables of a single page, in extraction order"""
+        return [table for (table_page, _), table in extraction['tables'].items() if table_page == page_num]
     
     def analyze(self):
         """Full analysis of PDF table structure"""
@@ -19,31 +120,31 @@ class TableDebugger:
         print(f"📄 ANALYZING: {self.pdf_path}")
         print("="*100)
         
-        with pdfplumber.open(self.pdf_path) as pdf:
-            self.pdf = pdf
+        extraction = self._load_tables()
+        
+        for page_num, page_info in extraction['pages'].items():
+            print(f"\n{'='*100}")
+            print(f"📃 PAGE {page_num + 1}")
+            print(f"{'='*100}")
             
-            for page_num, page in enumerate(pdf.pages):
-                print(f"\n{'='*100}")
-                print(f"📃 PAGE {page_num + 1}")
-                print(f"{'='*100}")
-                
-                # Show page dimensions
-                print(f"\n📐 Page Dimensions:")
-                print(f"   Width: {page.width}, Height: {page.height}")
-                
-                # Extract and show tables
-                self._analyze_tables(page, page_num)
-                
-                # Show text extraction comparison
-                self._compare_text_methods(page, page_num)
+            # Show page dimensions
+            print(f"\n📐 Page Dimensions:")
+            print(f"   Width: {page_info['width']}, Height: {page_info['height']}")
+            
+            # Show tables
+            self._analyze_tables(self._page_tables(extraction, page_num), page_num)
+            
+            # Show text extraction (full comparison only on request)
+            if self.compare_text:
+                self._compare_text_methods(page_info, page_num)
+            else:
+                self._show_simple_text(page_info, page_num)
     
-    def _analyze_tables(self, page, page_num: int):
+    def _analyze_tables(self, tables: List[List[List]], page_num: int):
         """Analyze tables on a page"""
         print(f"\n📊 TABLE ANALYSIS:")
         print("-" * 100)
         
-        tables = page.extract_tables()
-        
         if not tables:
             print("   ❌ No tables found on this page")
             return
@@ -61,35 +162,31 @@ class TableDebugger:
             print("   ⚠️  Empty table")
             return
         
-        # Create DataFrame
         try:
             # First row as headers
             headers = table[0]
             data = table[1:]
             
-            df = pd.DataFrame(data, columns=headers)
-            
-            print(f"   Rows: {len(df)}, Columns: {len(df.columns)}")
-            print(f"   Headers: {list(df.columns)}")
+            print(f"   Rows: {len(data)}, Columns: {len(headers)}")
+            print(f"   Headers: {list(headers)}")
             
-            # Show first few rows
+            # Show first few rows straight from the extracted lists
             print(f"\n   First 3 rows:")
             print("   " + "-" * 90)
             
-            display_df = df.head(3)
-            for idx, row in display_df.iterrows():
+            for idx, row in enumerate(data[:3]):
                 print(f"   Row {idx}:")
-                for col in df.columns:
-                    value = str(row[col])[:50]  # Truncate long values
+                for col, cell in zip(headers, row):
+                    value = str(cell)[:50]  # Truncate long values
                     print(f"      {col}: {value}")
                 print()
             
             # Identify likely table type
-            table_type = self._identify_table_type(df)
+            table_type = self._identify_table_type(headers)
             print(f"   🔍 Likely Type: {table_type}")
             
-            # Show potential issues
-            self._check_table_issues(df)
+            # Show potential issues (the only step that needs a DataFrame)
+            self._check_table_issues(pd.DataFrame(data, columns=headers))
             
         except Exception as e:
             print(f"   ❌ Error processing table: {e}")
@@ -97,9 +194,9 @@ class TableDebugger:
             for i, row in enumerate(table[:3]):
                 print(f"      Row {i}: {row}")
     
-    def _identify_table_type(self, df: pd.DataFrame) -> str:
+    def _identify_table_type(self, headers: List) -> str:
         """Identify what type of table this is"""
-        headers = [str(col).lower() for col in df.columns]
+        headers = [str(col).lower() for col in headers]
         
         # Transaction table
         if any('date' in h for h in headers) and any('amount' in h or 'debit' in h for h in headers):
@@ -120,8 +217,12 @@ class TableDebugger:
         """Check for common table extraction issues"""
         issues = []
         
+        # Materialize the cells once and reuse them for every check below
+        cells = df.to_numpy(dtype=object)
+        strs = cells.astype(str)
+        
         # Check for merged cells (None or empty values)
-        null_count = df.isnull().sum().sum()
+        null_count = int(pd.isna(cells).sum())
         if null_count > len(df) * 0.3:  # More than 30% null
             issues.append(f"⚠️  High number of empty cells ({null_count})")
         
@@ -131,28 +232,28 @@ class TableDebugger:
             issues.append(f"⚠️  {len(unnamed_cols)} column(s) without header")
         
         # Check for data in wrong columns (numbers in description, text in amounts)
-        for col in df.columns:
+        for col_idx, col in enumerate(df.columns):
             col_lower = str(col).lower()
             
             if 'amount' in col_lower or 'balance' in col_lower or 'debit' in col_lower or 'credit' in col_lower:
-                # Should be numeric
-                non_numeric = 0
-                for val in df[col]:
-                    val_str = str(val).strip()
-                    if val_str and val_str != 'nan':
-                        # Check if it's not a number
-                        cleaned = val_str.replace(',', '').replace('.', '').replace('₹', '').replace('Rs', '').strip()
-                        if not cleaned.replace('-', '').isdigit():
-                            non_numeric += 1
+                # Should be numeric: count non-blank cells that are not digits once
+                # separators, currency markers and minus signs are stripped
+                values = np.char.strip(strs[:, col_idx])
+                cleaned = values
+                for token in (',', '.', '₹', 'Rs'):
+                    cleaned = np.char.replace(cleaned, token, '')
+                cleaned = np.char.replace(np.char.strip(cleaned), '-', '')
+                non_numeric = int(((values != '') & (values != 'nan') & ~np.char.isdigit(cleaned)).sum())
                 
                 if non_numeric > len(df) * 0.2:  # More than 20%
                     issues.append(f"⚠️  Column '{col}' should be numeric but contains text")
         
         # Check for wide cells (might indicate merged data)
-        for col in df.columns:
-            avg_length = df[col].astype(str).str.len().mean()
-            if avg_length > 100:
-                issues.append(f"⚠️  Column '{col}' has very long values (avg: {avg_length:.0f} chars)")
+        if len(df):
+            avg_lengths = np.char.str_len(strs).mean(axis=0)
+            for col, avg_length in zip(df.columns, avg_lengths):
+                if avg_length > 100:
+                    issues.append(f"⚠️  Column '{col}' has very long values (avg: {avg_length:.0f} chars)")
         
         if issues:
             print("\n   ⚠️  POTENTIAL ISSUES:")
@@ -161,19 +262,32 @@ class TableDebugger:
         else:
             print("\n   ✅ No obvious issues detected")
     
-    def _compare_text_methods(self, page, page_num: int):
+    def _show_simple_text(self, page_info: Dict, page_num: int):
+        """Show the default text extraction only"""
+        print(f"\n📝 TEXT EXTRACTION:")
+        print("-" * 100)
+        
+        text_simple = page_info['text_simple']
+        
+        print(f"\n   Simple extraction (first 500 chars)")
+        print("   " + "-" * 90)
+        print("   " + (text_simple[:500] if text_simple else "No text").replace('\n', '\n   '))
+        print(f"\n   Length: {len(text_simple) if text_simple else 0} chars")
+        print(f"\n   💡 Use --compare-text to compare layout-preserving and tolerant extraction")
+    
+    def _compare_text_methods(self, page_info: Dict, page_num: int):
         """Compare different text extraction methods"""
         print(f"\n📝 TEXT EXTRACTION COMPARISON:")
         print("-" * 100)
         
         # Method 1: Simple text extraction
-        text_simple = page.extract_text()
+        text_simple = page_info['text_simple']
         
         # Method 2: Layout-preserving extraction
-        text_layout = page.extract_text(layout=True)
+        text_layout = page_info['text_layout']
         
         # Method 3: With x_tolerance and y_tolerance
-        text_tolerant = page.extract_text(x_tolerance=3, y_tolerance=3)
+        text_tolerant = page_info['text_tolerant']
         
         print(f"\n   Method 1: Simple extraction (first 500 chars)")
         print("   " + "-" * 90)
@@ -207,66 +321,79 @@ class TableDebugger:
         
         found_count = 0
         
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                tables = page.extract_tables()
-                
-                if not tables:
-                    continue
-                
-                for table_idx, table in enumerate(tables):
-                    if not table:
-                        continue
-                    
-                    # Search in table
-                    for row_idx, row in enumerate(table):
-                        for col_idx, cell in enumerate(row):
-                            if cell and search_term.lower() in str(cell).lower():
-                                found_count += 1
-                                print(f"\n   ✅ FOUND in Page {page_num + 1}, Table {table_idx + 1}")
-                                print(f"      Row {row_idx}, Column {col_idx}")
-                                print(f"      Cell value: '{cell}'")
-                                print(f"      Full row: {row}")
+        for (page_num, table_idx), table in self._load_tables()['tables'].items():
+            if not table:
+                continue
+            
+            # Search in table
+            for row_idx, row in enumerate(table):
+                for col_idx, cell in enumerate(row):
+                    if cell and search_term.lower() in str(cell).lower():
+                        found_count += 1
+                        print(f"\n   ✅ FOUND in Page {page_num + 1}, Table {table_idx + 1}")
+                        print(f"      Row {row_idx}, Column {col_idx}")
+                        print(f"      Cell value: '{cell}'")
+                        print(f"      Full row: {row}")
         
         if found_count == 0:
             print(f"\n   ❌ '{search_term}' not found in any tables")
         else:
             print(f"\n   Found {found_count} occurrence(s)")
     
-    def export_tables(self, output_prefix: str = "table_export"):
-        """Export all tables to CSV for inspection"""
+    def export_tables(self, output_prefix: str = "table_export", parquet: bool = False):
+        """Export all tables to CSV (or Parquet) for inspection"""
         print("\n" + "="*100)
         print("💾 EXPORTING TABLES")
         print("="*100)
         
+        if parquet and pa is None:
+            print("   ❌ Parquet export requires pyarrow (pip install pyarrow)")
+            return
+        
+        extension = "parquet" if parquet else "csv"
         export_count = 0
         
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                tables = page.extract_tables()
+        for (page_num, table_idx), table in self._load_tables()['tables'].items():
+            if not table or len(table) < 2:
+                continue
+            
+            try:
+                # Create DataFrame
+                df = pd.DataFrame(table[1:], columns=table[0])
                 
-                if not tables:
-                    continue
+                # Export to CSV / Parquet
+                filename = f"{output_prefix}_page{page_num + 1}_table{table_idx + 1}.{extension}"
+                if parquet:
+                    pq.write_table(self._arrow_table(df), filename)
+                else:
+                    self._write_csv(df, filename)
                 
-                for table_idx, table in enumerate(tables):
-                    if not table or len(table) < 2:
-                        continue
-                    
-                    try:
-                        # Create DataFrame
-                        df = pd.DataFrame(table[1:], columns=table[0])
-                        
-                        # Export to CSV
-                        filename = f"{output_prefix}_page{page_num + 1}_table{table_idx + 1}.csv"
-                        df.to_csv(filename, index=False)
-                        
-                        print(f"   ✅ Exported: {filename} ({len(df)} rows, {len(df.columns)} columns)")
-                        export_count += 1
-                    except Exception as e:
-                        print(f"   ❌ Failed to export Page {page_num + 1}, Table {table_idx + 1}: {e}")
+                print(f"   ✅ Exported: {filename} ({len(df)} rows, {len(df.columns)} columns)")
+                export_count += 1
+            except Exception as e:
+                print(f"   ❌ Failed to export Page {page_num + 1}, Table {table_idx + 1}: {e}")
         
         print(f"\n   Total tables exported: {export_count}")
     
+    def _arrow_table(self, df: pd.DataFrame) -> "pa.Table":
+        """
+        Arrow table for df; missing headers (None from pdfplumber) become ''
+        as df.to_csv writes them, instead of Arrow's literal "nan"
+        """
+        columns = ['' if pd.isna(c) else str(c) for c in df.columns]
+        return pa.Table.from_pandas(df.set_axis(columns, axis=1), preserve_index=False)
+    
+    def _write_csv(self, df: pd.DataFrame, filename: str):
+        """Write a table with pyarrow's C++ CSV writer, falling back to pandas"""
+        if pa is not None:
+            try:
+                pacsv.write_csv(self._arrow_table(df), filename)
+                return
+            except (pa.ArrowException, ValueError):
+                # e.g. duplicated headers, which Arrow tables reject
+                pass
+        df.to_csv(filename, index=False)
+    
     def show_recommendations(self):
         """Show recommendations based on analysis"""
         print("\n" + "="*100)
@@ -275,58 +402,52 @@ class TableDebugger:
         
         recommendations = []
         
-        with pdfplumber.open(self.pdf_path) as pdf:
-            total_tables = 0
-            pages_with_tables = 0
-            
-            for page in pdf.pages:
-                tables = page.extract_tables()
-                if tables:
-                    total_tables += len(tables)
-                    pages_with_tables += 1
+        tables = self._load_tables()['tables']
+        total_tables = len(tables)
+        pages_with_tables = len({page_num for page_num, _ in tables})
+        
+        if total_tables > 0:
+            recommendations.append(
+                "✅ USE TABLE-AWARE EXTRACTION\n"
+                f"   Found {total_tables} table(s) across {pages_with_tables} page(s).\n"
+                "   Use pdfplumber's extract_tables() instead of plain text extraction."
+            )
             
-            if total_tables > 0:
-                recommendations.append(
-                    "✅ USE TABLE-AWARE EXTRACTION\n"
-                    f"   Found {total_tables} table(s) across {pages_with_tables} page(s).\n"
-                    "   Use pdfplumber's extract_tables() instead of plain text extraction."
-                )
-                
-                recommendations.append(
-                    "✅ IDENTIFY TABLE COLUMNS\n"
-                    "   Look for column headers like 'Date', 'Description', 'Amount'.\n"
-                    "   Use these to correctly extract transaction data."
-                )
-                
-                recommendations.append(
-                    "✅ HANDLE EMPTY CELLS\n"
-                    "   Tables may have merged cells or empty values.\n"
-                    "   Use df.dropna() or df.fillna() to clean data."
-                )
-                
-                recommendations.append(
-                    "✅ VALIDATE COLUMN DATA\n"
-                    "   Check that amount columns contain numbers.\n"
-                    "   Check that date columns contain valid dates."
-                )
-            else:
-                recommendations.append(
-                    "⚠️  NO TABLES DETECTED\n"
-                    "   This PDF might not have structured tables.\n"
-                    "   Use layout-preserving text extraction instead."
-                )
+            recommendations.append(
+                "✅ IDENTIFY TABLE COLUMNS\n"
+                "   Look for column headers like 'Date', 'Description', 'Amount'.\n"
+                "   Use these to correctly extract transaction data."
+            )
             
             recommendations.append(
-                "✅ USE REGION-BASED EXTRACTION\n"
-                "   Extract header info from top region (card number, dates).\n"
-                "   Extract transactions from middle/bottom regions."
+                "✅ HANDLE EMPTY CELLS\n"
+                "   Tables may have merged cells or empty values.\n"
+                "   Use df.dropna() or df.fillna() to clean data."
             )
             
             recommendations.append(
-                "✅ TEST WITH MULTIPLE SAMPLES\n"
-                "   Table structures may vary across different statements.\n"
-                "   Test with 3-5 samples from the same bank."
+                "✅ VALIDATE COLUMN DATA\n"
+                "   Check that amount columns contain numbers.\n"
+                "   Check that date columns contain valid dates."
             )
+        else:
+            recommendations.append(
+                "⚠️  NO TABLES DETECTED\n"
+                "   This PDF might not have structured tables.\n"
+                "   Use layout-preserving text extraction instead."
+            )
+        
+        recommendations.append(
+            "✅ USE REGION-BASED EXTRACTION\n"
+            "   Extract header info from top region (card number, dates).\n"
+            "   Extract transactions from middle/bottom regions."
+        )
+        
+        recommendations.append(
+            "✅ TEST WITH MULTIPLE SAMPLES\n"
+            "   Table structures may vary across different statements.\n"
+            "   Test with 3-5 samples from the same bank."
+        )
         
         for i, rec in enumerate(recommendations, 1):
             print(f"\n{i}. {rec}")
@@ -340,22 +461,33 @@ def main():
         print("\nOptions:")
         print("  --search <term>     Search for a term in tables")
         print("  --export            Export all tables to CSV")
+        print("  --parquet           With --export, write Parquet instead (needs pyarrow)")
+        print("  --compare-text      Compare simple, layout and tolerant text extraction")
         print("\nExamples:")
         print("  python table_debugger.py statement.pdf")
         print("  python table_debugger.py statement.pdf --search 'Total Balance'")
         print("  python table_debugger.py statement.pdf --export")
+        print("  python table_debugger.py statement.pdf --compare-text")
+        print("  python table_debugger.py statement.pdf --search 'Total Balance' --export")
         return
     
     pdf_path = sys.argv[1]
-    debugger = TableDebugger(pdf_path)
+    options = sys.argv[2:]
+    
+    compare_text = "--compare-text" in options
+    if compare_text:
+        options.remove("--compare-text")
+    
+    debugger = TableDebugger(pdf_path, compare_text=compare_text)
     
-    # Check for options
-    if len(sys.argv) > 2:
-        if sys.argv[2] == "--search" and len(sys.argv) > 3:
-            search_term = sys.argv[3]
-            debugger.search_in_tables(search_term)
-        elif sys.argv[2] == "--export":
-            debugger.export_tables()
+    # Check for options (several may be combined; the PDF is only loaded once)
+    if options:
+        if "--search" in options:
+            idx = options.index("--search")
+            if idx + 1 < len(options):
+                debugger.search_in_tables(options[idx + 1])
+        if "--export" in options:
+            debugger.export_tables(parquet="--parquet" in options)
     else:
         # Full analysis
         debugger.analyze()
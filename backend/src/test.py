@@ -1,108 +1,156 @@
 import pytest
 import os
+import pandas as pd
 from parsers.amex_india_parser import AmexIndiaParser
 from parsers.hdfc_parser import HDFCParser
 from parsers.icici_parser import ICICIParser
 from parsers.kotak_parser import KotakParser
 from parsers.sbi_parser import SBIParser
+from sbi_table_parser import SBITableParser
+from utils.table_aware_extractor import TableAwarePDFExtractor, _table_to_dataframe
+
+
+# Parsers are stateless, so each is constructed once per module
+@pytest.fixture(scope='module')
+def amex():
+    return AmexIndiaParser()
+
+@pytest.fixture(scope='module')
+def hdfc():
+    return HDFCParser()
+
+@pytest.fixture(scope='module')
+def icici():
+    return ICICIParser()
+
+@pytest.fixture(scope='module')
+def kotak():
+    return KotakParser()
+
+@pytest.fixture(scope='module')
+def sbi():
+    return SBIParser()
+
 
 class TestIndianParsers:
     """Test suite for Indian bank parsers"""
     
-    def test_amex_parser_detection(self):
+    def test_amex_parser_detection(self, amex):
         """Test American Express parser can detect Amex statements"""
-        parser = AmexIndiaParser()
         amex_text = "American Express Banking Corp Statement of Account"
-        assert parser.can_parse(amex_text) == True
+        assert amex.can_parse(amex_text) == True
         
         non_amex_text = "HDFC Bank Credit Card Statement"
-        assert parser.can_parse(non_amex_text) == False
+        assert amex.can_parse(non_amex_text) == False
     
-    def test_hdfc_parser_detection(self):
+    def test_hdfc_parser_detection(self, hdfc):
         """Test HDFC parser can detect HDFC statements"""
-        parser = HDFCParser()
         hdfc_text = "HDFC Bank Credit Cards Statement Platinum Times Card"
-        assert parser.can_parse(hdfc_text) == True
+        assert hdfc.can_parse(hdfc_text) == True
     
-    def test_icici_parser_detection(self):
+    def test_icici_parser_detection(self, icici):
         """Test ICICI parser can detect ICICI statements"""
-        parser = ICICIParser()
         icici_text = "ICICI Bank Credit Cards Statement"
-        assert parser.can_parse(icici_text) == True
+        assert icici.can_parse(icici_text) == True
     
-    def test_kotak_parser_detection(self):
+    def test_kotak_parser_detection(self, kotak):
         """Test Kotak parser can detect Kotak statements"""
-        parser = KotakParser()
         kotak_text = "Kotak Corporate Credit Card Statement"
-        assert parser.can_parse(kotak_text) == True
+        assert kotak.can_parse(kotak_text) == True
     
-    def test_sbi_parser_detection(self):
+    def test_sbi_parser_detection(self, sbi):
         """Test SBI parser can detect SBI statements"""
-        parser = SBIParser()
         sbi_text = "State Bank of India Account Statement"
-        assert parser.can_parse(sbi_text) == True
+        assert sbi.can_parse(sbi_text) == True
     
-    def test_amex_card_number_extraction(self):
+    def test_amex_card_number_extraction(self, amex):
         """Test Amex card number extraction"""
-        parser = AmexIndiaParser()
         test_text = "Membership Number XXXX-XXXXXX-01007"
-        result = parser.extract_amex_card_number(test_text)
+        result = amex.extract_amex_card_number(test_text)
         assert result == "01007" or len(result) >= 4
     
-    def test_hdfc_card_number_extraction(self):
+    def test_hdfc_card_number_extraction(self, hdfc):
         """Test HDFC card number extraction"""
-        parser = HDFCParser()
         test_text = "Card No: 5228 52XX XXXX 0591"
-        result = parser.extract_hdfc_card_number(test_text)
+        result = hdfc.extract_hdfc_card_number(test_text)
         assert result == "0591"
     
-    def test_icici_card_number_extraction(self):
+    def test_icici_card_number_extraction(self, icici):
         """Test ICICI card number extraction"""
-        parser = ICICIParser()
         test_text = "Card Number : 4375 XXXX XXXX 3019"
-        result = parser.extract_icici_card_number(test_text)
+        result = icici.extract_icici_card_number(test_text)
         assert result == "3019"
     
-    def test_amount_extraction(self):
+    def test_amount_extraction(self, hdfc):
         """Test amount extraction with Indian number format"""
-        parser = HDFCParser()
-        assert parser.extractor.extract_amount("45,240.00") == 45240.0
-        assert parser.extractor.extract_amount("1,23,456.78") == 123456.78
-        assert parser.extractor.extract_amount("Rs 5,882.52") == 5882.52
+        assert hdfc.extractor.extract_amount("45,240.00") == 45240.0
+        assert hdfc.extractor.extract_amount("1,23,456.78") == 123456.78
+        assert hdfc.extractor.extract_amount("Rs 5,882.52") == 5882.52
     
-    def test_date_extraction(self):
+    def test_date_extraction(self, hdfc):
         """Test various date format extraction"""
-        parser = HDFCParser()
         test_text = "Payment Due Date 28/06/2019"
-        result = parser.extract_hdfc_due_date(test_text)
+        result = hdfc.extract_hdfc_due_date(test_text)
         assert "28/06/2019" in result or result != "N/A"
     
-    def test_transaction_extraction(self):
+    def test_transaction_extraction(self, hdfc):
         """Test transaction extraction"""
-        parser = HDFCParser()
         test_text = """
         23/05/2019 Flipkart Payments BANGALORE 8,249.00
         24/05/2019 FOOD PARK NORTH (24) P 360.00
         """
-        transactions = parser.extract_hdfc_transactions(test_text)
+        transactions = hdfc.extract_hdfc_transactions(test_text)
         assert len(transactions) > 0
         if transactions:
             assert transactions[0].amount > 0
             assert len(transactions[0].description) > 0
     
-    def test_balance_extraction(self):
+    def test_balance_extraction(self, amex):
         """Test balance extraction"""
-        parser = AmexIndiaParser()
         test_text = "Closing Balance Rs 56,856.49"
-        balance = parser.extract_amex_balance(test_text)
+        balance = amex.extract_amex_balance(test_text)
         assert balance == 56856.49 or balance > 0
     
-    def test_minimum_payment_extraction(self):
+    def test_minimum_payment_extraction(self, hdfc):
         """Test minimum payment extraction"""
-        parser = HDFCParser()
         test_text = "Minimum Amount Due 2,262.00"
-        minimum = parser.extract_hdfc_minimum(test_text)
+        minimum = hdfc.extract_hdfc_minimum(test_text)
         assert minimum == 2262.0 or minimum > 0
+    
+    def test_sbi_table_amount_unicode_whitespace(self, monkeypatch):
+        """Test SBI table amounts padded with NBSP still parse"""
+        parser = SBITableParser()
+        amounts = parser._parse_amount_series(pd.Series(['\xa01,234.50', ' Rs 20.00\u2009', '']))
+        assert amounts.tolist() == [1234.5, 20.0, 0.0]
+        assert parser._parse_amount('\xa01,234.50') == 1234.5
+        
+        # Same input through the pure-Python path used when Numba is missing
+        monkeypatch.setattr('sbi_table_parser.jit_parse_amount', None)
+        assert parser._parse_amount('\xa01,234.50') == 1234.5
+    
+    def test_sbi_table_amount_paths_agree(self, monkeypatch):
+        """Test the Numba and pure-Python SBI amount parsers agree"""
+        parser = SBITableParser()
+        inputs = ['€100', '₹1,234.50', '\xa0100', '1\xa0000', 'Rs 20', '$-5', '-5', '.5', 'abc', '1.2.3', 'nan']
+        jitted = [parser._parse_amount(s) for s in inputs]
+        
+        monkeypatch.setattr('sbi_table_parser.jit_parse_amount', None)
+        assert jitted == [parser._parse_amount(s) for s in inputs]
+        assert jitted[:3] == [0.0, 1234.5, 100.0]
+    
+    def test_find_in_tables_after_blank_row(self):
+        """Test table search returns the matching row when a blank row was dropped"""
+        df = _table_to_dataframe([
+            ['Date', 'Description', 'Amount'],
+            ['01/02/2023', 'GROCERY', '100.00'],
+            [None, None, None],
+            ['02/02/2023', 'FUEL STATION', '250.00'],
+        ])
+        tables = [{'page': 1, 'table_index': 0, 'data': df}]
+        matches = TableAwarePDFExtractor().find_in_tables(tables, 'fuel')
+        assert len(matches) == 1
+        assert matches[0]['row'] == 2
+        assert matches[0]['full_row']['Amount'] == '250.00'
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+JIT-compiled amount parsing for batch statement processing
+Uses Numba when installed; callers fall back to their regex parser otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _parse_amount_bytes(b: np.ndarray) -> float:
+    """
+    Parse ASCII amount bytes such as b'Rs 1,234.50' into a float
+    Skips whitespace, '$', 'Rs' and commas; returns 0.0 for anything non-numeric
+    """
+    mantissa = 0.0
+    scale = 0
+    seen_digit = False
+    seen_dot = False
+    negative = False
+    
+    i = 0
+    n = len(b)
+    while i < n:
+        c = b[i]
+        i += 1
+        if 48 <= c <= 57:  # 0-9
+            mantissa = mantissa * 10.0 + (c - 48)
+            seen_digit = True
+            if seen_dot:
+                scale += 1
+        elif c == 46:  # .
+            if seen_dot:
+                return 0.0
+            seen_dot = True
+        elif c == 45:  # -
+            if seen_digit or seen_dot or negative:
+                return 0.0
+            negative = True
+        elif c == 32 or c == 9 or c == 10 or c == 13 or c == 36 or c == 44:
+            continue  # whitespace, '$', ','
+        elif c == 82 and i < n and b[i] == 115:
+            i += 1  # 'Rs'
+        else:
+            return 0.0
+    
+    if not seen_digit:
+        return 0.0
+    
+    value = mantissa / 10.0 ** scale
+    return -value if negative else value
+
+
+if njit is not None:
+    _parse_amount_bytes = njit(cache=True)(_parse_amount_bytes)
+
+
+def parse_amount(amount_str: str) -> float:
+    """
+    Parse an amount string with the jitted scanner
+    Strips edge whitespace and '₹' like the regex parsers; any other non-ASCII is rejected
+    """
+    amount_str = amount_str.strip().replace('₹', '')
+    if not amount_str.isascii():
+        return 0.0
+    return _parse_amount_bytes(np.frombuffer(amount_str.encode('ascii'), dtype=np.uint8))
+
+
+# None when Numba is missing, so callers keep their existing parser
+jit_parse_amount = parse_amount if njit is not None else None
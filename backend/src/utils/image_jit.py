@@ -0,0 +1,79 @@
+"""
+JIT-compiled binarization for OCR preprocessing
+Uses Numba when installed; OCRProcessor falls back to cv2.threshold otherwise
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def _otsu_threshold(hist: np.ndarray, total: int) -> int:
+    """Otsu threshold of a 256-bin histogram (same search as OpenCV's THRESH_OTSU)"""
+    eps = 1.1920929e-07  # FLT_EPSILON
+    scale = 1.0 / total
+
+    mu = 0.0
+    for i in range(256):
+        mu += i * hist[i]
+    mu *= scale
+
+    mu1 = 0.0
+    q1 = 0.0
+    max_sigma = 0.0
+    max_val = 0
+    for i in range(256):
+        p_i = hist[i] * scale
+        mu1 *= q1
+        q1 += p_i
+        q2 = 1.0 - q1
+        if min(q1, q2) < eps or max(q1, q2) > 1.0 - eps:
+            continue
+        mu1 = (mu1 + i * p_i) / q1
+        mu2 = (mu - q1 * mu1) / q2
+        sigma = q1 * q2 * (mu1 - mu2) * (mu1 - mu2)
+        if sigma > max_sigma:
+            max_sigma = sigma
+            max_val = i
+    return max_val
+
+
+def _binarize_otsu(src: np.ndarray, dst: np.ndarray) -> int:
+    """
+    Histogram, Otsu threshold and binarization of a 2-D uint8 image
+    Writes 255/0 into dst (which may be src) without temporaries; returns the threshold
+    """
+    h, w = src.shape
+    hist = np.zeros(256, dtype=np.int64)
+    for y in range(h):
+        for x in range(w):
+            hist[src[y, x]] += 1
+
+    thresh = _otsu_threshold(hist, h * w)
+
+    for y in prange(h):
+        for x in range(w):
+            dst[y, x] = 255 if src[y, x] > thresh else 0
+    return thresh
+
+
+if njit is not None:
+    _otsu_threshold = njit(cache=True)(_otsu_threshold)
+    _binarize_otsu = njit(cache=True, parallel=True)(_binarize_otsu)
+
+
+def binarize_otsu(image: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Otsu-binarize a grayscale uint8 image into out (in place when out is image)"""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    if out is None:
+        out = np.empty_like(image)
+    _binarize_otsu(image, out)
+    return out
+
+
+# None when Numba is missing, so callers keep cv2.threshold
+jit_binarize_otsu = binarize_otsu if njit is not None else None
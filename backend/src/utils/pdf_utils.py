@@ -1,7 +1,25 @@
+import os
+import functools
 import PyPDF2
 import pdfplumber
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterator
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+_CURRENCY_RE = re.compile(r'[$,]')
+_NUMBER_RE = re.compile(r'[\d,]+\.?\d*')
+
+def _read_text_pdfplumber(pdf_path, max_pages: Optional[int] = None) -> str:
+    return "".join(PDFExtractor.iter_pages_text(pdf_path, max_pages))
+
+@functools.lru_cache(maxsize=64)
+def _cached_text_pdfplumber(path: str, mtime_ns: int, size: int, max_pages: Optional[int]) -> str:
+    """Text of a file path; mtime_ns and size key out stale entries for rewritten files"""
+    return _read_text_pdfplumber(path, max_pages)
 
 class PDFExtractor:
     @staticmethod
@@ -16,15 +34,62 @@ class PDFExtractor:
         return text
     
     @staticmethod
-    def extract_text_pdfplumber(pdf_path: str) -> str:
-        """Extract text using pdfplumber for better table extraction"""
-        text = ""
-        with pdfplumber.open(pdf_path) as pdf:
+    def extract_text_pdfplumber(pdf_path: str, max_pages: Optional[int] = None) -> str:
+        """
+        Extract text using pdfplumber for better table extraction
+        max_pages limits extraction to the first pages (e.g. 1 for issuer detection)
+        """
+        # File paths are cached across calls (validate_pdf and parser.parse
+        # both extract the same file); file objects are read every time
+        if isinstance(pdf_path, (str, os.PathLike)):
+            path = os.path.abspath(pdf_path)
+            st = os.stat(path)
+            return _cached_text_pdfplumber(path, st.st_mtime_ns, st.st_size, max_pages or None)
+        return _read_text_pdfplumber(pdf_path, max_pages)
+    
+    @staticmethod
+    def iter_pages_text(pdf_path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield each non-empty page's text plus a newline, one page at a time
+        Joined, the pages equal extract_text_pdfplumber's output
+        """
+        pages = list(range(1, max_pages + 1)) if max_pages else None
+        with pdfplumber.open(pdf_path, pages=pages) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text()
+                page.flush_cache()
                 if page_text:
-                    text += page_text + "\n"
-        return text
+                    yield page_text + "\n"
+    
+    @staticmethod
+    def iter_pages_text_fast(pdf_path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+        """
+        Like iter_pages_text, but through PDFium's plain text layer (no layout analysis)
+        Much faster, reading order may differ: use for detection and previews, not parsing
+        Falls back to iter_pages_text when pypdfium2 is not installed
+        """
+        if pdfium is None:
+            yield from PDFExtractor.iter_pages_text(pdf_path, max_pages)
+            return
+        
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            count = len(pdf) if not max_pages else min(max_pages, len(pdf))
+            for i in range(count):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range().replace("\r\n", "\n")
+                textpage.close()
+                page.close()
+                if page_text:
+                    yield page_text + "\n"
+        finally:
+            pdf.close()
+    
+    @staticmethod
+    def extract_text_fast(pdf_path: str, max_pages: Optional[int] = None) -> str:
+        """Raw text for detection and previews (see iter_pages_text_fast)"""
+        return "".join(PDFExtractor.iter_pages_text_fast(pdf_path, max_pages))
     
     @staticmethod
     def extract_tables_pdfplumber(pdf_path: str) -> List[List[List[str]]]:
@@ -49,9 +114,9 @@ class PDFExtractor:
     def extract_amount(text: str) -> float:
         """Extract monetary amount from text"""
         # Remove currency symbols and commas
-        text = re.sub(r'[$,]', '', text)
+        text = _CURRENCY_RE.sub('', text)
         # Find numeric pattern
-        match = re.search(r'[\d,]+\.?\d*', text)
+        match = _NUMBER_RE.search(text)
         if match:
             try:
                 return float(match.group())
@@ -1,32 +1,103 @@
+import os
+import functools
 import PyPDF2
 import pdfplumber
 import re
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
+from PIL import Image
 from .ocr_utils import OCRProcessor
 
+# Documents up to this many pages are OCR'd in-process (reported in batches of
+# this size), since starting a process pool costs more than it saves on them
+_BATCH_OCR_MAX_PAGES = 4
+
+_CONFIDENCE_KEYWORDS = ('statement', 'balance', 'payment', 'account', 'credit',
+                        'card', 'transaction', 'due', 'date', 'amount', 'total')
+
+# Compiled once; calculate_confidence runs on every extraction
+_DATE_RES = (
+    re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}'),
+    re.compile(r'\d{1,2}-\d{1,2}-\d{2,4}'),
+    re.compile(r'[A-Za-z]+ \d{1,2}, \d{4}'),
+)
+_AMOUNT_RE = re.compile(r'\$[\d,]+\.?\d*')
+_CARD_RE = re.compile(r'[Xx*]{4}[\s-]?[Xx*]{4}[\s-]?[Xx*]{4}[\s-]?\d{4}')
+
+
+def _processor_settings(processor: OCRProcessor) -> Tuple[int, int, bool, Optional[str]]:
+    """Constructor arguments that rebuild an equivalent OCRProcessor in a worker"""
+    cache_dir = str(processor.cache_dir) if processor.cache_dir else None
+    return (processor.dpi, processor.thread_count, processor.aggressive, cache_dir)
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_processor(settings: Tuple[int, int, bool, Optional[str]]) -> OCRProcessor:
+    """
+    One OCRProcessor per worker process and settings, so its Tesseract handle is
+    reused across pages and it OCRs exactly like the parent's processor
+    """
+    dpi, thread_count, aggressive, cache_dir = settings
+    return OCRProcessor(dpi=dpi, thread_count=thread_count, aggressive=aggressive,
+                        cache_dir=cache_dir)
+
+
+def _ocr_page(page: Union[np.ndarray, Tuple[str, Tuple[int, int], bytes]],
+              settings: Tuple[int, int, bool, Optional[str]]) -> str:
+    """
+    OCR one page in a worker process
+    PIL pages travel as (mode, size, raw bytes), which pickles far cheaper than
+    a PIL Image; numpy pages (PyMuPDF rendering) are sent as-is
+    """
+    if isinstance(page, tuple):
+        mode, size, data = page
+        page = Image.frombytes(mode, size, data)
+    return _worker_processor(settings).extract_text_from_image(page)
+
+
 class EnhancedPDFExtractor:
     def __init__(self):
         self.ocr_processor = OCRProcessor()
+        # ((path, mtime_ns, size), page texts) of the last document read, so
+        # the scanned check, text extraction and confidence scoring share one parse
+        self._last_pages = None
+    
+    def _page_texts(self, pdf_path: str) -> List[Optional[str]]:
+        """Text of every page from a single pdfplumber.open"""
+        # Only file paths are stable keys; file objects are read every time.
+        # mtime and size are in the key so a rewritten file is parsed again
+        key = None
+        if isinstance(pdf_path, (str, os.PathLike)):
+            st = os.stat(pdf_path)
+            key = (os.path.abspath(pdf_path), st.st_mtime_ns, st.st_size)
+            if self._last_pages is not None and self._last_pages[0] == key:
+                return self._last_pages[1]
+        
+        with pdfplumber.open(pdf_path) as pdf:
+            texts = [page.extract_text() for page in pdf.pages]
+        
+        if key is not None:
+            self._last_pages = (key, texts)
+        return texts
     
     def is_scanned_pdf(self, pdf_path: str) -> bool:
         """Check if PDF is scanned (image-based) or text-based"""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                first_page = pdf.pages[0]
-                text = first_page.extract_text()
-                
-                # If very little text is extracted, it's likely scanned
-                if not text or len(text.strip()) < 50:
+            text = self._page_texts(pdf_path)[0]
+            
+            # If very little text is extracted, it's likely scanned
+            if not text or len(text.strip()) < 50:
+                return True
+            
+            # Check if text is mostly gibberish (bad OCR in PDF)
+            words = text.split()
+            if words:
+                # Check if most "words" are just symbols or numbers (readable = ASCII letters only)
+                readable_words = sum(1 for w in words if w.isascii() and w.isalpha())
+                if readable_words < len(words) * 0.3:
                     return True
-                
-                # Check if text is mostly gibberish (bad OCR in PDF)
-                words = text.split()
-                if words:
-                    # Check if most "words" are just symbols or numbers
-                    readable_words = [w for w in words if re.match(r'^[a-zA-Z]+$', w)]
-                    if len(readable_words) < len(words) * 0.3:
-                        return True
-                        
+                    
             return False
         except:
             return True
@@ -57,10 +128,15 @@ class EnhancedPDFExtractor:
                    'transaction', 'credit', 'card', 'date', 'amount']
         
         text_lower = text.lower()
-        keyword_count = sum(1 for keyword in keywords if keyword in text_lower)
         
-        # If we find several keywords, text is likely good
-        return keyword_count >= 3
+        # If we find several keywords, text is likely good; stop at the third
+        keyword_count = 0
+        for keyword in keywords:
+            if keyword in text_lower:
+                keyword_count += 1
+                if keyword_count >= 3:
+                    return True
+        return False
     
     def extract_text_with_ocr(self, pdf_path: str) -> str:
         """Extract text using OCR"""
@@ -69,27 +145,34 @@ class EnhancedPDFExtractor:
         # Convert PDF to images
         images = self.ocr_processor.pdf_to_images(pdf_path)
         
-        for i, image in enumerate(images):
-            print(f"Processing page {i+1} with OCR...")
+        workers = min(len(images), os.cpu_count() or 1)
+        if workers <= 1 or len(images) <= _BATCH_OCR_MAX_PAGES:
+            for start in range(0, len(images), _BATCH_OCR_MAX_PAGES):
+                batch = images[start:start + _BATCH_OCR_MAX_PAGES]
+                print(f"Processing pages {start+1}-{start+len(batch)} with OCR...")
+                
+                # Extract text from the page images
+                all_text.extend(self.ocr_processor.extract_text_from_pages(batch))
             
-            # Extract text from image
-            page_text = self.ocr_processor.extract_text_from_image(image)
-            all_text.append(page_text)
+            return "\n".join(all_text)
+        
+        # Tesseract is not thread-safe, so OCR pages in separate processes;
+        # map() keeps the page order
+        print(f"Processing {len(images)} pages with OCR ({workers} workers)...")
+        pages = [image if isinstance(image, np.ndarray) else (image.mode, image.size, image.tobytes())
+                 for image in images]
+        ocr_page = functools.partial(_ocr_page, settings=_processor_settings(self.ocr_processor))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            all_text = list(executor.map(ocr_page, pages))
         
         return "\n".join(all_text)
     
     def extract_text_pdfplumber(self, pdf_path: str) -> str:
         """Extract text using pdfplumber"""
-        text = ""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            return "".join(page_text + "\n" for page_text in self._page_texts(pdf_path) if page_text)
         except:
-            pass
-        return text
+            return ""
     
     def extract_with_confidence_scores(self, pdf_path: str) -> Dict[str, Any]:
         """
@@ -139,30 +222,26 @@ class EnhancedPDFExtractor:
         score = 0.0
         
         # Check for statement keywords
-        keywords = ['statement', 'balance', 'payment', 'account', 'credit', 
-                   'card', 'transaction', 'due', 'date', 'amount', 'total']
-        
         text_lower = text.lower()
-        for keyword in keywords:
+        for keyword in _CONFIDENCE_KEYWORDS:
             if keyword in text_lower:
                 score += 0.1
         
+        # Score is capped at 1.0, so skip the pattern searches once it is reached
+        if score >= 1.0:
+            return 1.0
+        
         # Check for date patterns
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{2,4}',
-            r'\d{1,2}-\d{1,2}-\d{2,4}',
-            r'[A-Za-z]+ \d{1,2}, \d{4}'
-        ]
-        for pattern in date_patterns:
-            if re.search(pattern, text):
+        for pattern in _DATE_RES:
+            if pattern.search(text):
                 score += 0.1
         
         # Check for amount patterns
-        if re.search(r'\$[\d,]+\.?\d*', text):
+        if _AMOUNT_RE.search(text):
             score += 0.2
         
         # Check for card number patterns
-        if re.search(r'[Xx*]{4}[\s-]?[Xx*]{4}[\s-]?[Xx*]{4}[\s-]?\d{4}', text):
+        if _CARD_RE.search(text):
             score += 0.2
         
         return min(score, 1.0)
\ No newline at end of file
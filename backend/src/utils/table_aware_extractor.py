@@ -3,10 +3,70 @@ Table-Aware PDF Extractor
 Handles PDFs with tables correctly by preserving structure
 """
 
+import io
+import os
+import functools
 import pdfplumber
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple, Optional
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+# Spawning workers only pays off once each one gets a few pages
+_MIN_PAGES_PER_WORKER = 4
+
+# Key/value and layout field patterns
+_KV_RE = re.compile(r'([A-Za-z\s]+?)[\s:]+([^\n]+)')
+_CARD_RE = re.compile(r'[Xx*]{4}[\s-]*[Xx*]{4}[\s-]*[Xx*]{4}[\s-]*(\d{4})')
+_BALANCE_RE = re.compile(r'(?:Total|Balance|Due)[\s:]+[\$₹Rs\.]*\s*([\d,]+\.?\d*)')
+_AMOUNT_STRIP_RE = re.compile(r'[₹$Rs\s]')
+
+# Field type -> pattern for TableBasedParser._extract_from_layout (value in group 1)
+_FIELD_PATTERNS = {
+    'card': _CARD_RE,
+    'balance': _BALANCE_RE,
+}
+
+def _table_to_dataframe(table: List[List]) -> pd.DataFrame:
+    """Convert a raw pdfplumber table (header row first) to a DataFrame"""
+    df = pd.DataFrame(table[1:], columns=table[0])
+    return df.dropna(how='all')  # Remove empty rows
+
+class _LazyTable(dict):
+    """
+    Table entry whose 'data' DataFrame is only built when first read
+    Most tables on a statement page are never looked at as DataFrames
+    """
+    
+    def __missing__(self, key):
+        if key != 'data':
+            raise KeyError(key)
+        try:
+            df = _table_to_dataframe(self['raw'])
+        except Exception:
+            df = pd.DataFrame()  # Malformed table: behaves as an empty one
+        self['data'] = df
+        return df
+
+def _read_pdf_bytes(pdf_path) -> bytes:
+    """Raw bytes of a PDF given as a path or a file-like object"""
+    if hasattr(pdf_path, 'read'):
+        pdf_path.seek(0)
+        return pdf_path.read()
+    with open(pdf_path, 'rb') as f:
+        return f.read()
+
+def _extract_page_range(data: bytes, page_nums: List[int], debug: bool) -> List[Tuple[int, Dict]]:
+    """
+    Run _extract_page_with_tables over a subset of pages
+    Opens a private handle on the PDF bytes, so it is safe to run in a worker
+    """
+    extractor = TableAwarePDFExtractor()
+    extractor.debug = debug
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [(page_num, extractor._extract_page_with_tables(pdf.pages[page_num], page_num))
+                for page_num in page_nums]
 
 class TableAwarePDFExtractor:
     """
@@ -29,18 +89,35 @@ class TableAwarePDFExtractor:
         }
         
         with pdfplumber.open(pdf_path) as pdf:
-            all_text = []
-            
-            for page_num, page in enumerate(pdf.pages):
-                page_data = self._extract_page_with_tables(page, page_num)
-                
-                all_text.append(page_data['text'])
-                result['tables'].extend(page_data['tables'])
-                result['text_by_region'].update(page_data['regions'])
+            page_count = len(pdf.pages)
             
-            result['raw_text'] = '\n'.join(all_text)
-            result['metadata']['total_pages'] = len(pdf.pages)
-            result['metadata']['total_tables'] = len(result['tables'])
+            # Fan long documents out across workers (pdfminer is pure Python, so
+            # processes rather than threads); short statements stay in-process
+            workers = min(os.cpu_count() or 1, page_count // _MIN_PAGES_PER_WORKER)
+            if workers <= 1:
+                pages_data = [self._extract_page_with_tables(page, page_num)
+                              for page_num, page in enumerate(pdf.pages)]
+        
+        if workers > 1:
+            data = _read_pdf_bytes(pdf_path)
+            chunks = [list(range(page_count))[i::workers] for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parts = list(executor.map(_extract_page_range, [data] * workers, chunks,
+                                          [self.debug] * workers))
+            # Merge back in page order
+            pages_data = [page_data for _, page_data in sorted(
+                (item for part in parts for item in part), key=lambda item: item[0]
+            )]
+        
+        all_text = []
+        for page_data in pages_data:
+            all_text.append(page_data['text'])
+            result['tables'].extend(page_data['tables'])
+            result['text_by_region'].update(page_data['regions'])
+        
+        result['raw_text'] = '\n'.join(all_text)
+        result['metadata']['total_pages'] = page_count
+        result['metadata']['total_tables'] = len(result['tables'])
         
         return result
     
@@ -59,49 +136,49 @@ class TableAwarePDFExtractor:
             # Process each table
             for table_idx, table in enumerate(tables):
                 if table and len(table) > 0:
-                    # Convert to DataFrame for easier processing
-                    try:
-                        df = pd.DataFrame(table[1:], columns=table[0])
-                        df = df.dropna(how='all')  # Remove empty rows
-                        
-                        # Store structured table
-                        result['tables'].append({
-                            'page': page_num,
-                            'table_index': table_idx,
-                            'data': df,
-                            'raw': table
-                        })
-                        
-                        if self.debug:
+                    # Store structured table; its DataFrame is built on first access
+                    table_info = _LazyTable(page=page_num, table_index=table_idx, raw=table)
+                    result['tables'].append(table_info)
+                    
+                    if self.debug:
+                        try:
+                            df = _table_to_dataframe(table)
                             print(f"\n=== Table {table_idx} on Page {page_num} ===")
                             print(df.to_string())
-                    except Exception as e:
-                        if self.debug:
+                        except Exception as e:
                             print(f"Error processing table {table_idx}: {e}")
         
         # Extract text with layout
         text = page.extract_text(layout=True)
         result['text'] = text if text else ''
         
-        # Extract text by regions (top, middle, bottom)
+        # Extract text by regions (top, middle, bottom), sharing one char list
         height = page.height
+        chars = page.chars
         result['regions'][f'page_{page_num}_top'] = self._extract_region(
-            page, 0, height * 0.3
+            page, 0, height * 0.3, chars
         )
         result['regions'][f'page_{page_num}_middle'] = self._extract_region(
-            page, height * 0.3, height * 0.7
+            page, height * 0.3, height * 0.7, chars
         )
         result['regions'][f'page_{page_num}_bottom'] = self._extract_region(
-            page, height * 0.7, height
+            page, height * 0.7, height, chars
         )
         
         return result
     
-    def _extract_region(self, page, y0: float, y1: float) -> str:
-        """Extract text from a specific region of the page"""
+    def _extract_region(self, page, y0: float, y1: float, chars: Optional[List[Dict]] = None) -> str:
+        """
+        Extract text from a specific region of the page
+        Same output as page.crop(bbox).extract_text(layout=True), but only the chars
+        are clipped instead of every object on the page
+        """
         bbox = (0, y0, page.width, y1)
-        cropped = page.crop(bbox)
-        text = cropped.extract_text(layout=True)
+        region_chars = pdfplumber.utils.crop_to_bbox(page.chars if chars is None else chars, bbox)
+        text = pdfplumber.utils.chars_to_textmap(
+            region_chars, layout=True, x_shift=0, y_shift=y0,
+            layout_width=page.width, layout_height=y1 - y0
+        ).as_string
         return text if text else ''
     
     def find_in_tables(self, tables: List[Dict], search_term: str) -> List[Dict]:
@@ -110,22 +187,27 @@ class TableAwarePDFExtractor:
         Returns list of matches with context
         """
         matches = []
+        term = search_term.lower()
         
         for table_info in tables:
             df = table_info['data']
             
-            # Search in all cells
-            for col in df.columns:
-                for idx, value in df[col].items():
-                    if value and search_term.lower() in str(value).lower():
-                        matches.append({
-                            'page': table_info['page'],
-                            'table_index': table_info['table_index'],
-                            'column': col,
-                            'row': idx,
-                            'value': value,
-                            'full_row': df.iloc[idx].to_dict()
-                        })
+            # Search in all non-empty cells at once, then walk hits column by column
+            cells = df.to_numpy(dtype=object)
+            strs = cells.astype(str)
+            mask = (np.char.find(np.char.lower(strs), term) >= 0) & ~pd.isna(cells) & (strs != '')
+            cols, rows = np.nonzero(mask.T)
+            
+            for c, r in zip(cols, rows):
+                idx = df.index[r]
+                matches.append({
+                    'page': table_info['page'],
+                    'table_index': table_info['table_index'],
+                    'column': df.columns[c],
+                    'row': idx,
+                    'value': df.iat[r, c],
+                    'full_row': df.iloc[r].to_dict()
+                })
         
         return matches
     
@@ -155,8 +237,7 @@ class TableAwarePDFExtractor:
         pairs = {}
         
         # Pattern for key: value pairs
-        pattern = r'([A-Za-z\s]+?)[\s:]+([^\n]+)'
-        matches = re.findall(pattern, text)
+        matches = _KV_RE.findall(text)
         
         for key, value in matches:
             key = key.strip()
@@ -246,6 +327,15 @@ class TableAwarePDFExtractor:
         return output_text
 
 
+@functools.lru_cache(maxsize=None)
+def shared_extractor() -> TableAwarePDFExtractor:
+    """
+    Process-wide TableAwarePDFExtractor, created on first use
+    Lets every table parser a dispatcher constructs reuse one instance
+    """
+    return TableAwarePDFExtractor()
+
+
 class TableBasedParser:
     """
     Base class for parsers that work with table-aware extraction
@@ -278,19 +368,17 @@ class TableBasedParser:
         Extract field using layout-aware approach
         Override in subclasses for bank-specific logic
         """
+        # Pick the field's pattern once instead of branching per region
+        pattern = _FIELD_PATTERNS.get(field_type)
+        if pattern is None:
+            return "N/A"
+        
         # Search in top region first (most summary info is at top)
         for region_name, region_text in extraction['text_by_region'].items():
             if 'top' in region_name:
-                # Extract based on field type
-                if field_type == 'card':
-                    match = re.search(r'[Xx*]{4}[\s-]*[Xx*]{4}[\s-]*[Xx*]{4}[\s-]*(\d{4})', region_text)
-                    if match:
-                        return match.group(1)
-                
-                elif field_type == 'balance':
-                    match = re.search(r'(?:Total|Balance|Due)[\s:]+[\$₹Rs\.]*\s*([\d,]+\.?\d*)', region_text)
-                    if match:
-                        return match.group(1)
+                match = pattern.search(region_text)
+                if match:
+                    return match.group(1)
         
         return "N/A"
     
@@ -347,7 +435,7 @@ class TableBasedParser:
     def _clean_amount(self, amount_str: str) -> float:
         """Clean and convert amount string to float"""
         # Remove currency symbols and spaces
-        cleaned = re.sub(r'[₹$Rs\s]', '', amount_str)
+        cleaned = _AMOUNT_STRIP_RE.sub('', amount_str)
         # Remove commas
         cleaned = cleaned.replace(',', '')
         
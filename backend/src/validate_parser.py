@@ -5,7 +5,11 @@ Run this to manually verify parser accuracy against actual PDFs
 
 import sys
 import os
-from pathlib import Path
+import io
+import contextlib
+import traceback
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 from utils.pdf_utils import PDFExtractor
 from parsers.amex_india_parser import AmexIndiaParser
 from parsers.hdfc_parser import HDFCParser
@@ -13,25 +17,68 @@ from parsers.icici_parser import ICICIParser
 from parsers.kotak_parser import KotakParser
 from parsers.sbi_parser import SBIParser
 
+# Pages streamed for issuer detection (and the scanned-PDF check) before
+# falling back to the whole document
+_DETECTION_MAX_PAGES = 3
+
+# Full tracebacks for parse errors
+_VERBOSE = bool(os.environ.get("VALIDATE_VERBOSE"))
+
+# Thousands separators dropped from search terms
+_STRIP_COMMAS = str.maketrans("", "", ",")
+
 class ValidationTool:
     def __init__(self):
-        self.parsers = [
-            AmexIndiaParser(),
-            HDFCParser(),
-            ICICIParser(),
-            KotakParser(),
-            SBIParser()
+        # Detection priority follows insertion order
+        self.parsers_by_key = {
+            "amex": AmexIndiaParser(),
+            "hdfc": HDFCParser(),
+            "icici": ICICIParser(),
+            "kotak": KotakParser(),
+            "sbi": SBIParser(),
+        }
+        self.parsers = list(self.parsers_by_key.values())
+        # can_parse compares against lowercased text, so only lowercase tokens can hit
+        self._indicators = [
+            (parser, tuple(t for t in parser.INDICATORS if t == t.lower()))
+            for parser in self.parsers
         ]
         self.extractor = PDFExtractor()
     
+    def _detect_parser(self, text: str):
+        """
+        Highest-priority parser whose indicators appear in text
+        Same result as the first can_parse hit, but the text is lowercased once
+        instead of once per parser
+        """
+        text_lower = text.lower()
+        for parser, indicators in self._indicators:
+            for indicator in indicators:
+                if indicator in text_lower:
+                    return parser
+        return None
+    
     def validate_pdf(self, pdf_path: str):
         """Validate a single PDF file"""
         print(f"\n{'='*80}")
         print(f"VALIDATING: {os.path.basename(pdf_path)}")
         print(f"{'='*80}\n")
         
-        # Extract raw text
-        text = self.extractor.extract_text_pdfplumber(pdf_path)
+        # Stream pages until the issuer shows up: it is branded on the first page,
+        # so detection cost does not grow with the statement. Detection and the
+        # preview only need raw text, so they skip pdfplumber's layout pass; the
+        # parser does its own full extraction anyway
+        text = ""
+        parser = None
+        for page_text in self.extractor.iter_pages_text_fast(pdf_path, _DETECTION_MAX_PAGES):
+            text += page_text
+            parser = self._detect_parser(text)
+            if parser:
+                break
+        
+        def full_text() -> str:
+            # Cached by the extractor, and shared with parser.parse below
+            return self.extractor.extract_text_pdfplumber(pdf_path)
         
         # Show first 500 characters of raw text
         print("📄 RAW TEXT PREVIEW (first 500 chars):")
@@ -40,12 +87,17 @@ class ValidationTool:
         print("-" * 80)
         print()
         
-        # Find appropriate parser
-        parser = None
-        for p in self.parsers:
-            if p.can_parse(text):
-                parser = p
-                break
+        # Image-only pages yield (next to) no text; don't decompress the rest of a scan.
+        # A detected parser means the loop stopped early on a short, branded cover
+        # page, so only the whole document can tell that apart from a scan
+        if len(text.strip()) < 50 and (not parser or len(full_text().strip()) < 50):
+            print("❌ ERROR: Likely a scanned PDF, OCR required")
+            print("\n💡 TIP: Run it through EnhancedPDFExtractor.extract_text_hybrid")
+            return
+        
+        # Whole document if the first pages have no issuer token
+        if not parser:
+            parser = self._detect_parser(full_text())
         
         if not parser:
             print("❌ ERROR: No parser found for this PDF")
@@ -73,8 +125,10 @@ class ValidationTool:
             print(f"📝 TRANSACTIONS ({len(statement.transactions or [])}):")
             print("-" * 80)
             if statement.transactions:
-                for i, txn in enumerate(statement.transactions, 1):
-                    print(f"{i}. {txn.date:15} {txn.description:40} ₹{txn.amount:>10,.2f}")
+                # One write for the whole table instead of a print per row
+                lines = [f"{i}. {txn.date:15} {txn.description:40} ₹{txn.amount:>10,.2f}"
+                         for i, txn in enumerate(statement.transactions, 1)]
+                sys.stdout.write("\n".join(lines) + "\n")
             else:
                 print("No transactions extracted")
             print("-" * 80)
@@ -82,60 +136,118 @@ class ValidationTool:
             # Validation checklist
             print("\n✓ VALIDATION CHECKLIST:")
             print("-" * 80)
-            self._print_validation_item("Card Number", statement.card_last_four, statement.card_last_four != "N/A")
-            self._print_validation_item("Billing Cycle", statement.billing_cycle, statement.billing_cycle != "N/A")
-            self._print_validation_item("Due Date", statement.payment_due_date, statement.payment_due_date != "N/A")
-            self._print_validation_item("Balance", f"₹{statement.total_balance:,.2f}", statement.total_balance > 0)
-            self._print_validation_item("Transactions", f"{len(statement.transactions or [])} found", len(statement.transactions or []) > 0)
+            txn_count = len(statement.transactions or [])
+            items = [
+                # (label, shown value, passed)
+                ("Card Number", statement.card_last_four, statement.card_last_four != "N/A"),
+                ("Billing Cycle", statement.billing_cycle, statement.billing_cycle != "N/A"),
+                ("Due Date", statement.payment_due_date, statement.payment_due_date != "N/A"),
+                ("Balance", f"₹{statement.total_balance:,.2f}", statement.total_balance > 0),
+                ("Transactions", f"{txn_count} found", txn_count > 0),
+            ]
+            sys.stdout.write("\n".join(self._format_validation_item(*item) for item in items) + "\n")
             print("-" * 80)
             
             # Search functionality
             print("\n🔍 SEARCH IN RAW TEXT:")
             print("-" * 80)
-            self._search_in_text(text, "card number", statement.card_last_four)
-            self._search_in_text(text, "balance", str(int(statement.total_balance)))
+            self._search_in_text(text, "card number", statement.card_last_four, full_text)
+            self._search_in_text(text, "balance", str(int(statement.total_balance)), full_text)
             print("-" * 80)
             
         except Exception as e:
             print(f"❌ ERROR during parsing: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            # Walking the frames is only worth it when someone will read them
+            if _VERBOSE:
+                print(traceback.format_exc())
+            else:
+                print("   (set VALIDATE_VERBOSE=1 for the traceback)")
     
-    def _print_validation_item(self, label, value, is_valid):
+    def _format_validation_item(self, label, value, is_valid):
         status = "✅" if is_valid else "❌"
-        print(f"{status} {label:20} : {value}")
+        return f"{status} {label:20} : {value}"
     
-    def _search_in_text(self, text, label, search_term):
-        """Search for a term in the raw text"""
+    def _search_in_text(self, text, label, search_term, full_text=None):
+        """
+        Search for a term in the raw text
+        full_text, if given, is called to fetch the whole document when text misses
+        """
         if not search_term or search_term == "N/A":
             return
         
-        # Clean search term
-        search_term = str(search_term).replace(",", "")
+        # Clean search term (callers mostly pass clean strings already)
+        if not isinstance(search_term, str):
+            search_term = str(search_term)
+        if "," in search_term:
+            search_term = search_term.translate(_STRIP_COMMAS)
         
-        if search_term in text:
-            # Find context around the match
+        # One find per haystack; its index doubles as the membership test
+        index = text.find(search_term)
+        if index == -1 and full_text is not None:
+            text = full_text()
             index = text.find(search_term)
-            start = max(0, index - 50)
-            end = min(len(text), index + len(search_term) + 50)
-            context = text[start:end].replace('\n', ' ')
-            print(f"Found '{label}': ...{context}...")
-        else:
+        
+        if index == -1:
             print(f"⚠️  '{search_term}' not found in raw text for {label}")
+            return
+        
+        # Context around the match (slicing already clamps the end)
+        context = text[max(0, index - 50):index + len(search_term) + 50].replace('\n', ' ')
+        print(f"Found '{label}': ...{context}...")
     
     def batch_validate(self, pdf_directory: str):
         """Validate all PDFs in a directory"""
-        pdf_files = list(Path(pdf_directory).glob("*.pdf"))
+        pdf_files = _iter_pdfs(pdf_directory)
         
-        if not pdf_files:
+        # Peek far enough to tell "none" and "just one" apart without listing the directory
+        head = list(itertools.islice(pdf_files, 2))
+        if not head:
             print(f"No PDF files found in {pdf_directory}")
             return
         
-        print(f"\n🔍 Found {len(pdf_files)} PDF files to validate\n")
+        print(f"\n🔍 Validating PDF files in {pdf_directory}\n")
+        pdf_files = itertools.chain(head, pdf_files)
+        count = 0
         
-        for pdf_file in pdf_files:
-            self.validate_pdf(str(pdf_file))
-            print("\n" + "="*80 + "\n")
+        workers = os.cpu_count() or 1
+        if workers <= 1 or len(head) < 2:
+            for pdf_file in pdf_files:
+                self.validate_pdf(pdf_file)
+                print("\n" + "="*80 + "\n")
+                count += 1
+        else:
+            # Each worker builds one ValidationTool and returns its captured report,
+            # so reports still print whole and in directory order
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+                for report in ex.map(_validate_one, pdf_files):
+                    print(report, end="")
+                    print("\n" + "="*80 + "\n")
+                    count += 1
+        
+        print(f"🔍 Validated {count} PDF files")
+
+def _iter_pdfs(pdf_directory: str):
+    """Yield PDF paths in a directory; scandir's dirents spare a stat per entry"""
+    with os.scandir(pdf_directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                yield entry.path
+
+_worker_tool = None
+
+def _init_worker():
+    """Build the per-process ValidationTool once"""
+    global _worker_tool
+    _worker_tool = ValidationTool()
+
+def _validate_one(pdf_path: str) -> str:
+    """Validate one PDF in a worker process and return the printed report"""
+    if _worker_tool is None:
+        _init_worker()
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        _worker_tool.validate_pdf(pdf_path)
+    return buf.getvalue()
 
 def main():
     tool = ValidationTool()
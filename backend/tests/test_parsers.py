@@ -6,28 +6,33 @@ from parsers.bofa_parser import BofAParser
 from parsers.citi_parser import CitiParser
 from parsers.wells_fargo_parser import WellsFargoParser
 
+# Parsers are stateless, so one instance each serves the whole test session
+@pytest.fixture(scope="session")
+def chase_parser():
+    return ChaseParser()
+
+@pytest.fixture(scope="session")
+def amex_parser():
+    return AmexParser()
+
 class TestParsers:
-    def test_chase_parser_detection(self):
-        parser = ChaseParser()
+    def test_chase_parser_detection(self, chase_parser):
         chase_text = "Chase Bank Statement Account Summary"
-        assert parser.can_parse(chase_text) == True
+        assert chase_parser.can_parse(chase_text) == True
         
         non_chase_text = "Bank of America Statement"
-        assert parser.can_parse(non_chase_text) == False
+        assert chase_parser.can_parse(non_chase_text) == False
     
-    def test_amex_parser_detection(self):
-        parser = AmexParser()
+    def test_amex_parser_detection(self, amex_parser):
         amex_text = "American Express Statement of Account"
-        assert parser.can_parse(amex_text) == True
+        assert amex_parser.can_parse(amex_text) == True
     
-    def test_card_number_extraction(self):
-        parser = ChaseParser()
+    def test_card_number_extraction(self, chase_parser):
         test_text = "Account Number: XXXX-XXXX-XXXX-1234"
-        result = parser.extract_card_last_four(test_text)
+        result = chase_parser.extract_card_last_four(test_text)
         assert result == "1234"
     
-    def test_amount_extraction(self):
-        parser = ChaseParser()
-        assert parser.extractor.extract_amount("$1,234.56") == 1234.56
-        assert parser.extractor.extract_amount("1234.56") == 1234.56
-        assert parser.extractor.extract_amount("$1,234") == 1234.0
\ No newline at end of file
+    def test_amount_extraction(self, chase_parser):
+        assert chase_parser.extractor.extract_amount("$1,234.56") == 1234.56
+        assert chase_parser.extractor.extract_amount("1234.56") == 1234.56
+        assert chase_parser.extractor.extract_amount("$1,234") == 1234.0
\ No newline at end of file